@@ -10,32 +10,763 @@ from datetime import datetime, timedelta
 import threading
 import time
 import os
+import argparse
+import contextlib
+import tracemalloc
+import hashlib
+import json
+import tempfile
+import shutil
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+# Severity levels ordered from least to most severe; the index is the rank
+SEVERITY_LEVELS = ("safe", "moderate", "high", "critical")
+
+# Default bands as (severity, distance factor, time factor) relative to the
+# safety_distance / time_threshold passed to check_conflicts, most severe first.
+# The outermost band is the conflict envelope itself.
+DEFAULT_SEVERITY_BANDS = (
+    ("critical", 0.25, 0.25),
+    ("high", 0.5, 0.5),
+    ("moderate", 1.0, 1.0),
+)
+
+# How often the GUI sweeps expired missions out of the active set
+MISSION_LIFECYCLE_INTERVAL_MS = 60 * 1000
+
+# Mission statuses; missions store the index so every status value is shared
+MISSION_STATUSES = ("active", "aborted", "inactive", "completed", "pending")
+_STATUS_CODES = {status: code for code, status in enumerate(MISSION_STATUSES)}
+
+# Naive datetimes are treated as wall-clock time relative to this epoch, which
+# matches how pandas converts naive timestamps to and from epoch seconds
+_EPOCH = datetime(1970, 1, 1)
+
+def normalize_status(value, default="active"):
+    """Map a status cell to a known mission status; blank or unknown values use default"""
+    if not isinstance(value, str):
+        return default
+    status = value.strip().lower()
+    if status not in _STATUS_CODES:
+        print(f"Unknown mission status {value!r}, using {default!r}")
+        return default
+    return status
+
+def to_epoch_seconds(value):
+    """Convert a datetime/Timestamp (or an epoch-second number) to epoch seconds"""
+    if isinstance(value, (int, float, np.number)):
+        return float(value)
+    return (value - _EPOCH).total_seconds()
+
+def from_epoch_seconds(seconds):
+    """Convert epoch seconds back to a naive datetime"""
+    return _EPOCH + timedelta(seconds=float(seconds))
 
 class DroneMission:
-    def __init__(self, mission_id, waypoints, start_time, duration, status="active", status_timestamp=None):
+    """Compact mission record.
+
+    Waypoints live in a single (n + 2, 4) numpy array of x, y, z and epoch seconds;
+    the two trailing rows hold the lazily computed bounding box, so the box costs
+    no object of its own.
+    With ``coordinate_dtype=np.float32`` the array is stored as float32 and the
+    time column holds seconds since the mission start, which keeps sub-second
+    precision. Timestamps are stored as epoch seconds and exposed as datetimes
+    through properties so callers keep working with the familiar types.
+    """
+    __slots__ = ('mission_id', '_waypoints', '_start', '_duration', '_status', '_status_ts',
+                 'conflict', 'severity', 'conflict_points')
+    
+    def __init__(self, mission_id, waypoints, start_time, duration, status="active", status_timestamp=None,
+                 coordinate_dtype=np.float64):
         self.mission_id = mission_id
-        self.waypoints = waypoints  # List of (x, y, z, t)
         self.start_time = start_time
         self.duration = duration
-        self.status = status  # "active", "aborted", "inactive", "completed"
-        self.status_timestamp = status_timestamp or datetime.now()
+        self.set_waypoints(waypoints, coordinate_dtype)  # List of (x, y, z, t) or (n, 4) array
+        self.status = status
+        self.status_timestamp = datetime.now() if status_timestamp is None or pd.isna(status_timestamp) else status_timestamp
         self.conflict = False
+        self.severity = "safe"
+        self.conflict_points = ()  # Waypoints (x, y, z) of this mission inside a severity band
+    
+    def set_waypoints(self, waypoints, coordinate_dtype=np.float64):
+        """Store waypoints given as (x, y, z, t) tuples or an (n, 4) array of epoch seconds"""
+        if isinstance(waypoints, np.ndarray):
+            array = np.array(waypoints, dtype=float).reshape(-1, 4)
+        else:
+            array = np.array([(x, y, z, to_epoch_seconds(t)) for x, y, z, t in waypoints],
+                             dtype=float).reshape(-1, 4)
+        if np.dtype(coordinate_dtype) == np.float32:
+            array[:, 3] -= self._start
+        # Copy into a standalone array so no view keeps a larger base array alive;
+        # the NaN box rows mark the bounding box as not yet computed
+        storage = np.empty((len(array) + 2, 4), dtype=coordinate_dtype)
+        storage[:-2] = array
+        storage[-2:] = np.nan
+        self._waypoints = storage
+    
+    @property
+    def waypoints(self):
+        """Waypoints as a list of (x, y, z, datetime) tuples"""
+        return [(x, y, z, from_epoch_seconds(t)) for x, y, z, t in self.waypoint_array().tolist()]
+    
+    @waypoints.setter
+    def waypoints(self, waypoints):
+        self.set_waypoints(waypoints, self._waypoints.dtype)
+    
+    @property
+    def num_waypoints(self):
+        return len(self._waypoints) - 2
+    
+    def waypoint_array(self):
+        """Return waypoints as an (n, 4) float64 array of x, y, z and epoch seconds"""
+        if self._waypoints.dtype == np.float64:
+            return self._waypoints[:-2]
+        array = self._waypoints[:-2].astype(np.float64)
+        array[:, 3] += self._start
+        return array
+    
+    def bounding_box(self):
+        """Return the cached (2, 4) min/max box over x, y, z and epoch seconds.
 
-class DroneConflictDetectionSystem:
+        The box is recomputed only after the waypoints or start time change. A mission
+        without waypoints gets a NaN box, which never overlaps anything.
+        """
+        box = self._waypoints[-2:]
+        if np.isnan(box[0, 0]) and self.num_waypoints:
+            waypoints = self._waypoints[:-2]
+            box[0] = waypoints.min(axis=0)
+            box[1] = waypoints.max(axis=0)
+        if box.dtype == np.float64:
+            return box
+        box = box.astype(np.float64)
+        box[:, 3] += self._start
+        return box
+    
+    @property
+    def status(self):
+        return MISSION_STATUSES[self._status]
+    
+    @status.setter
+    def status(self, status):
+        try:
+            self._status = _STATUS_CODES[status.strip().lower()]
+        except (KeyError, AttributeError):
+            raise ValueError(f"Unknown mission status: {status}") from None
+    
+    @property
+    def start_time(self):
+        return from_epoch_seconds(self._start)
+    
+    @start_time.setter
+    def start_time(self, value):
+        start = to_epoch_seconds(value)
+        waypoints = getattr(self, '_waypoints', None)
+        if waypoints is not None and waypoints.dtype != np.float64:
+            # float32 waypoint times are relative to the start, keep them anchored
+            waypoints[:, 3] += self._start - start
+        self._start = start
+        if waypoints is not None:
+            waypoints[-2:] = np.nan
+    
+    @property
+    def start_epoch(self):
+        return self._start
+    
+    @property
+    def end_epoch(self):
+        return self._start + self._duration
+    
+    @property
+    def duration(self):
+        return timedelta(seconds=self._duration)
+    
+    @duration.setter
+    def duration(self, value):
+        self._duration = value.total_seconds() if isinstance(value, timedelta) else float(value)
+    
+    @property
+    def duration_seconds(self):
+        return self._duration
+    
+    @property
+    def status_timestamp(self):
+        return from_epoch_seconds(self._status_ts)
+    
+    @status_timestamp.setter
+    def status_timestamp(self, value):
+        self._status_ts = to_epoch_seconds(value)
+
+# Upper bound on primary x test waypoint pairs held in memory at once
+CONFLICT_CHUNK_PAIRS = 4_000_000
+
+def boxes_overlap(box, boxes, distance_margin, time_margin):
+    """Vectorized test of one (2, 4) box against (n, 2, 4) boxes inflated by the margins"""
+    margin = np.array([distance_margin, distance_margin, distance_margin, time_margin], dtype=float)
+    boxes = np.asarray(boxes).reshape(-1, 2, 4)
+    return np.all((boxes[:, 0, :] <= box[1] + margin) & (boxes[:, 1, :] >= box[0] - margin), axis=1)
+
+def mission_boxes(missions):
+    """Stack the cached bounding boxes of missions into an (n, 2, 4) array"""
+    if not missions:
+        return np.empty((0, 2, 4))
+    return np.array([m.bounding_box() for m in missions])
+
+def evaluate_conflict_levels(primary, test, bands):
+    """Evaluate severity bands for every primary/test waypoint pair.
+
+    ``primary`` and ``test`` are (n, 4) arrays of x, y, z and epoch seconds; ``bands``
+    are absolute bands ordered least severe first. Returns, per test waypoint, the
+    worst severity rank and the distance and time gap of its closest in-band hit.
+    """
+    num_test = len(test)
+    waypoint_levels = np.zeros(num_test, dtype=np.int8)
+    hit_distance = np.full(num_test, np.inf)
+    hit_time = np.full(num_test, np.inf)
+    if len(primary) == 0 or num_test == 0:
+        return waypoint_levels, hit_distance, hit_time
+    
+    chunk = max(1, CONFLICT_CHUNK_PAIRS // len(primary))
+    for start in range(0, num_test, chunk):
+        block = test[start:start + chunk]
+        # (primary waypoints x test waypoints) distance and time-gap matrices
+        time_diff = np.abs(primary[:, 3, None] - block[None, :, 3])
+        distance = np.sqrt(((primary[:, None, :3] - block[None, :, :3]) ** 2).sum(axis=2))
+        
+        levels = np.zeros(distance.shape, dtype=np.int8)
+        for name, max_distance, max_time in bands:
+            levels[(distance <= max_distance) & (time_diff <= max_time)] = SEVERITY_LEVELS.index(name)
+        
+        # Closest hit per test waypoint, for reporting
+        masked_distance = np.where(levels > 0, distance, np.inf)
+        closest = masked_distance.argmin(axis=0)
+        cols = np.arange(len(block))
+        waypoint_levels[start:start + chunk] = levels.max(axis=0)
+        hit_distance[start:start + chunk] = masked_distance[closest, cols]
+        hit_time[start:start + chunk] = np.where(levels[closest, cols] > 0, time_diff[closest, cols], np.inf)
+    
+    return waypoint_levels, hit_distance, hit_time
+
+# Default grid for sweep_conflict_thresholds
+SWEEP_SAFETY_DISTANCES = (50, 100, 150, 250)
+SWEEP_TIME_THRESHOLDS = (30, 60, 120)
+
+# Default search grid for suggest_resolution: departure shifts (s) and altitude offsets (m)
+RESOLUTION_TIME_SHIFTS = np.arange(-3600, 3601, 60)
+RESOLUTION_ALTITUDE_OFFSETS = np.arange(-200, 201, 10)
+# Cost of one metre of altitude change expressed in seconds of delay (10 m ~ 1 min)
+RESOLUTION_SECONDS_PER_METER = 6.0
+# Lowest altitude a suggested offset may take any waypoint to
+MIN_ALTITUDE = 50
+
+# Airspace size at which the GUI switches to the multi-process conflict check
+PARALLEL_CHECK_MIN_MISSIONS = 50_000
+
+def minimum_distances_by_time(primary, test, time_thresholds):
+    """Per test waypoint, the closest primary waypoint distance within each time threshold.
+
+    Returns an (n, len(time_thresholds)) array of distances (inf when no primary
+    waypoint is within the threshold) plus the unconditional minimum distance and
+    minimum time gap per test waypoint.
+    """
+    num_test = len(test)
+    by_time = np.full((num_test, len(time_thresholds)), np.inf)
+    min_distance = np.full(num_test, np.inf)
+    min_time_gap = np.full(num_test, np.inf)
+    if len(primary) == 0 or num_test == 0:
+        return by_time, min_distance, min_time_gap
+    
+    chunk = max(1, CONFLICT_CHUNK_PAIRS // len(primary))
+    for start in range(0, num_test, chunk):
+        block = test[start:start + chunk]
+        time_diff = np.abs(primary[:, 3, None] - block[None, :, 3])
+        distance = np.sqrt(((primary[:, None, :3] - block[None, :, :3]) ** 2).sum(axis=2))
+        for i, max_time in enumerate(time_thresholds):
+            by_time[start:start + chunk, i] = np.where(time_diff <= max_time, distance, np.inf).min(axis=0)
+        min_distance[start:start + chunk] = distance.min(axis=0)
+        min_time_gap[start:start + chunk] = time_diff.min(axis=0)
+    
+    return by_time, min_distance, min_time_gap
+
+class SharedAirspace:
+    """Versioned airspace snapshots published in shared memory.
+
+    Each publish() writes the mission offsets (int64, num_missions + 1), the mission
+    bounding boxes (float64, num_missions x 2 x 4) and the concatenated waypoints
+    (float64, num_waypoints x 4) into a new shared memory segment and bumps the
+    version. Segments are immutable, so a reader that acquired a version keeps a
+    consistent view while newer versions are published; a segment is unlinked once
+    it is neither current nor acquired.
+    """
+    
     def __init__(self):
+        self.version = 0
+        self._segments = {}  # version -> {'shm', 'descriptor', 'missions', 'offsets', 'waypoints', 'refs'}
+        self._lock = threading.Lock()
+    
+    def publish(self, missions):
+        """Publish a new snapshot of missions and return its version"""
+        arrays = [m.waypoint_array() for m in missions]
+        offsets = np.concatenate(([0], np.cumsum([len(a) for a in arrays]))).astype(np.int64)
+        boxes = mission_boxes(missions)
+        waypoints = np.concatenate(arrays) if arrays else np.empty((0, 4))
+        
+        size = max(offsets.nbytes + boxes.nbytes + waypoints.nbytes, 1)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        shared_offsets = np.ndarray(offsets.shape, dtype=np.int64, buffer=shm.buf)
+        shared_offsets[:] = offsets
+        np.ndarray(boxes.shape, dtype=np.float64, buffer=shm.buf, offset=offsets.nbytes)[:] = boxes
+        shared_waypoints = np.ndarray(waypoints.shape, dtype=np.float64, buffer=shm.buf,
+                                      offset=offsets.nbytes + boxes.nbytes)
+        shared_waypoints[:] = waypoints
+        
+        with self._lock:
+            self.version += 1
+            descriptor = (shm.name, self.version, len(missions), len(waypoints))
+            self._segments[self.version] = {'shm': shm, 'descriptor': descriptor, 'missions': list(missions),
+                                            'offsets': shared_offsets, 'waypoints': shared_waypoints,
+                                            'refs': 0}
+            self._release_stale()
+            return self.version
+    
+    def acquire(self):
+        """Pin the current snapshot or return None if nothing is published.
+
+        Returns (descriptor, missions, offsets, waypoints); the arrays are views on the
+        publisher's own mapping and must not be kept past release().
+        """
+        with self._lock:
+            segment = self._segments.get(self.version)
+            if segment is None:
+                return None
+            segment['refs'] += 1
+            return segment['descriptor'], segment['missions'], segment['offsets'], segment['waypoints']
+    
+    def release(self, descriptor):
+        """Unpin a snapshot returned by acquire()"""
+        with self._lock:
+            segment = self._segments.get(descriptor[1])
+            if segment is not None:
+                segment['refs'] -= 1
+            self._release_stale()
+    
+    def close(self):
+        """Unlink every segment, including pinned ones"""
+        with self._lock:
+            for segment in self._segments.values():
+                self._unlink(segment)
+            self._segments = {}
+    
+    def _release_stale(self):
+        for version in [v for v, seg in self._segments.items() if v != self.version and seg['refs'] <= 0]:
+            self._unlink(self._segments.pop(version))
+    
+    @staticmethod
+    def _unlink(segment):
+        shm = segment['shm']
+        # Drop our views first; the mapping cannot close while arrays export it
+        segment['offsets'] = segment['waypoints'] = None
+        try:
+            shm.close()
+        except BufferError:
+            pass  # A caller still holds views; the mapping goes away with them
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+# Segments attached by this (worker) process, keyed by shared memory name
+_attached_airspace = {}
+
+def attach_shared_airspace(descriptor):
+    """Attach zero-copy to a published snapshot; returns (offsets, boxes, waypoints) views"""
+    name, version, num_missions, num_waypoints = descriptor
+    if name not in _attached_airspace:
+        # Workers only ever need the newest snapshot, drop older attachments
+        for old_name in list(_attached_airspace):
+            old_shm = _attached_airspace.pop(old_name)[0]
+            old_shm.close()
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:  # Python < 3.13 has no track argument
+            shm = shared_memory.SharedMemory(name=name)
+        offsets = np.ndarray((num_missions + 1,), dtype=np.int64, buffer=shm.buf)
+        boxes = np.ndarray((num_missions, 2, 4), dtype=np.float64, buffer=shm.buf, offset=offsets.nbytes)
+        waypoints = np.ndarray((num_waypoints, 4), dtype=np.float64, buffer=shm.buf,
+                               offset=offsets.nbytes + boxes.nbytes)
+        _attached_airspace[name] = (shm, offsets, boxes, waypoints)
+    return _attached_airspace[name][1:]
+
+def _check_conflicts_chunk(descriptor, primary, bands, first_mission, last_mission):
+    """Worker task: evaluate one contiguous range of missions from a shared snapshot"""
+    offsets, boxes, waypoints = attach_shared_airspace(descriptor)
+    first, last = offsets[first_mission], offsets[last_mission]
+    waypoint_levels = np.zeros(last - first, dtype=np.int8)
+    hit_distance = np.full(last - first, np.inf)
+    hit_time = np.full(last - first, np.inf)
+    
+    # Cheap reject on the shared bounding boxes before any waypoint work
+    primary_box = np.array([primary.min(axis=0), primary.max(axis=0)])
+    overlap = boxes_overlap(primary_box, boxes[first_mission:last_mission],
+                            max(band[1] for band in bands), max(band[2] for band in bands))
+    keep = np.repeat(overlap, np.diff(offsets[first_mission:last_mission + 1]))
+    if keep.any():
+        results = evaluate_conflict_levels(primary, waypoints[first:last][keep], bands)
+        waypoint_levels[keep], hit_distance[keep], hit_time[keep] = results
+    return waypoint_levels, hit_distance, hit_time
+
+def mission_content_hash(missions):
+    """SHA-256 over mission ids, statuses and waypoint arrays.
+
+    Times are hashed as whole microseconds because the datetime round trip through
+    CSV can move epoch seconds by one float ulp.
+    """
+    content = hashlib.sha256()
+    content.update("\0".join(f"{m.mission_id}\0{m.status}\0{m.num_waypoints}" for m in missions).encode())
+    if missions:
+        waypoints = np.concatenate([m.waypoint_array() for m in missions])
+        content.update(np.ascontiguousarray(waypoints[:, :3]).tobytes())
+        content.update(np.rint(waypoints[:, 3] * 1e6).astype(np.int64).tobytes())
+    return content.hexdigest()
+
+class ConflictResultCache:
+    """Disk-backed LRU cache of conflict check results.
+
+    Each entry is a JSON file named after its key. Reads refresh the file's
+    modification time, and writes evict the least recently used entries once the
+    directory grows past ``max_bytes``. Keys are content hashes, so a changed
+    primary mission, airspace or threshold simply misses.
+    """
+    
+    def __init__(self, directory="conflict_cache", max_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+    
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+    
+    def get(self, key):
+        """Return the cached record for key, or None"""
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                record = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return record
+    
+    def put(self, key, record):
+        """Store a record atomically and evict old entries if over budget"""
+        with self._lock:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+                with os.fdopen(fd, "w") as f:
+                    json.dump(record, f)
+                os.replace(temp_path, self._path(key))
+                self._evict()
+            except OSError as e:
+                print(f"Error writing conflict cache: {e}")
+    
+    def clear(self):
+        """Delete every cached entry"""
+        with self._lock:
+            for path in self._entries():
+                os.remove(path)
+    
+    def _entries(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                if name.endswith(".json")]
+    
+    def _evict(self):
+        entries = []
+        for path in self._entries():
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+class WriteBehindPersistence:
+    """Background writer that coalesces mission CSV writes.
+
+    Rewrites of the same file are coalesced, so a burst of mutations costs one
+    write of the latest snapshot. Appends are kept in order and written before
+    rewrites, so an archive never lags behind the files it was evicted from.
+    flush() is a barrier for everything submitted before the call. A failed write
+    is counted in stats(), makes the flush that waited for it return False and is
+    retried after ``retry_delay`` seconds, unless a newer snapshot of the same file
+    has replaced it. Writes still failing at close() are dropped.
+    """
+    
+    def __init__(self, write, coalesce_delay=0.2, retry_delay=1.0):
+        self._write = write  # callable(missions, filename, append)
+        self.coalesce_delay = coalesce_delay
+        self.retry_delay = retry_delay
+        self._retry_at = None  # Monotonic time of the next retry after a failed write
+        self._cond = threading.Condition()
+        self._rewrites = {}  # filename -> latest missions snapshot
+        self._appends = []  # (missions, filename) in submission order
+        self._submitted = 0
+        self._taken = 0  # Submissions handed to the worker so far
+        self._completed = 0
+        self._failed_ranges = deque(maxlen=64)  # (first, last) submissions of failed batches
+        self._flush_requested = False
+        self._writing = False
+        self._closed = False
+        self.flush_count = 0
+        self.coalesced_writes = 0
+        self.failed_flushes = 0
+        self.last_error = None
+        self.last_flush_latency = 0.0
+        self.total_flush_latency = 0.0
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+    
+    @property
+    def queue_depth(self):
+        """Number of file writes waiting for the next flush"""
+        with self._cond:
+            return len(self._rewrites) + len(self._appends)
+    
+    def submit(self, missions, filename, append=False):
+        """Queue a rewrite (or append) of filename with a snapshot of missions"""
+        with self._cond:
+            if append:
+                self._appends.append((list(missions), filename))
+            else:
+                if filename in self._rewrites:
+                    self.coalesced_writes += 1
+                self._rewrites[filename] = list(missions)
+            self._submitted += 1
+            self._cond.notify_all()
+    
+    def flush(self, timeout=None):
+        """Block until everything submitted so far is written.
+
+        Returns False on timeout or if a write this call waited for failed.
+        """
+        with self._cond:
+            baseline = self._completed
+            target = self._submitted
+            if self._rewrites or self._appends:
+                # Only skip the coalescing delay when there is something to write
+                self._flush_requested = True
+                self._cond.notify_all()
+            if not self._cond.wait_for(lambda: self._completed >= target, timeout):
+                return False
+            return not any(last > baseline and first <= target for first, last in self._failed_ranges)
+    
+    def discard(self):
+        """Drop pending writes and wait for an in-flight flush to finish"""
+        with self._cond:
+            self._rewrites = {}
+            self._appends = []
+            self._cond.wait_for(lambda: not self._writing)
+            self._taken = self._completed = self._submitted
+            self._retry_at = None
+            self._cond.notify_all()
+    
+    def close(self):
+        """Flush pending writes and stop the worker thread"""
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+    
+    def stats(self):
+        return {
+            'queue_depth': self.queue_depth,
+            'flush_count': self.flush_count,
+            'coalesced_writes': self.coalesced_writes,
+            'failed_flushes': self.failed_flushes,
+            'last_error': self.last_error,
+            'last_flush_ms': self.last_flush_latency * 1000,
+            'mean_flush_ms': self.total_flush_latency * 1000 / max(self.flush_count, 1)
+        }
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._rewrites or self._appends or self._closed)
+                if self._closed and not (self._rewrites or self._appends):
+                    return
+                # Let a burst of mutations accumulate unless someone is waiting on a flush;
+                # after a failure, back off before retrying even if a flush is waiting
+                retrying = self._retry_at is not None
+                deadline = self._retry_at if retrying else time.monotonic() + self.coalesce_delay
+                while not self._closed and (retrying or not self._flush_requested):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                self._retry_at = None
+                appends, rewrites = self._appends, self._rewrites
+                self._appends, self._rewrites = [], {}
+                first, target = self._taken + 1, self._submitted
+                self._taken = target
+                self._flush_requested = False
+                self._writing = True
+            
+            start = time.perf_counter()
+            error = None
+            failed_appends, failed_rewrites = [], {}
+            for index, (missions, filename) in enumerate(appends):
+                try:
+                    self._write(missions, filename, True)
+                except Exception as e:
+                    error = e
+                    print(f"Error appending missions to {filename}: {e}")
+                    # Later appends must not overtake this one, and rewrites must wait so
+                    # no mission leaves a file before it reached the archive
+                    failed_appends, failed_rewrites, rewrites = appends[index:], rewrites, {}
+                    break
+            for filename, missions in rewrites.items():
+                try:
+                    self._write(missions, filename, False)
+                except Exception as e:
+                    error = e
+                    print(f"Error writing missions to {filename}: {e}")
+                    failed_rewrites[filename] = missions
+            latency = time.perf_counter() - start
+            
+            with self._cond:
+                if error is not None:
+                    self.failed_flushes += 1
+                    self.last_error = str(error)
+                    self._failed_ranges.append((first, target))
+                    if self._closed:
+                        print(f"Dropping {len(failed_appends) + len(failed_rewrites)} failed writes at shutdown")
+                    else:
+                        self._appends[:0] = failed_appends
+                        for filename, missions in failed_rewrites.items():
+                            # A snapshot submitted since supersedes the failed one
+                            self._rewrites.setdefault(filename, missions)
+                        self._retry_at = time.monotonic() + self.retry_delay
+                self._writing = False
+                self._completed = max(self._completed, target)
+                self.flush_count += 1
+                self.last_flush_latency = latency
+                self.total_flush_latency += latency
+                self._cond.notify_all()
+
+class LiveAirspaceIndex:
+    """Time-sorted waypoint index over missions that supports incremental inserts.
+
+    Waypoints are kept sorted by time so a query only scans the slice inside a
+    time window. Inserted missions go to a small unsorted buffer that is merged
+    into the sorted arrays once it grows past ``merge_threshold`` waypoints.
+    """
+    
+    def __init__(self, missions=(), merge_threshold=4096):
+        self.missions = []
+        self.merge_threshold = merge_threshold
+        self._waypoints = np.empty((0, 4))
+        self._owners = np.empty(0, dtype=np.int64)
+        self._pending = []  # (waypoints, owners) of missions inserted since the last merge
+        self._pending_count = 0
+        for mission in missions:
+            self._add(mission)
+        self._merge()
+    
+    def __len__(self):
+        return len(self.missions)
+    
+    def insert(self, mission):
+        """Add a mission to the index"""
+        self._add(mission)
+        if self._pending_count >= self.merge_threshold:
+            self._merge()
+    
+    def query(self, t_min, t_max):
+        """Return (waypoints, owner indices into self.missions) with t_min <= t <= t_max"""
+        times = self._waypoints[:, 3]
+        first = np.searchsorted(times, t_min, side='left')
+        last = np.searchsorted(times, t_max, side='right')
+        waypoints = [self._waypoints[first:last]]
+        owners = [self._owners[first:last]]
+        for pending_waypoints, pending_owners in self._pending:
+            in_window = (pending_waypoints[:, 3] >= t_min) & (pending_waypoints[:, 3] <= t_max)
+            waypoints.append(pending_waypoints[in_window])
+            owners.append(pending_owners[in_window])
+        return np.concatenate(waypoints), np.concatenate(owners)
+    
+    def _add(self, mission):
+        waypoints = mission.waypoint_array()
+        self._pending.append((waypoints, np.full(len(waypoints), len(self.missions), dtype=np.int64)))
+        self._pending_count += len(waypoints)
+        self.missions.append(mission)
+    
+    def _merge(self):
+        if not self._pending:
+            return
+        waypoints = np.concatenate([self._waypoints] + [w for w, _ in self._pending])
+        owners = np.concatenate([self._owners] + [o for _, o in self._pending])
+        order = np.argsort(waypoints[:, 3], kind='stable')
+        self._waypoints = waypoints[order]
+        self._owners = owners[order]
+        self._pending = []
+        self._pending_count = 0
+
+class DroneConflictDetectionSystem:
+    def __init__(self, coordinate_dtype=np.float64, write_behind=True):
+        self.coordinate_dtype = coordinate_dtype  # np.float32 halves waypoint memory
+        # CSV writes go through a background thread unless write_behind is False
+        self.persistence = WriteBehindPersistence(self.save_missions_to_csv) if write_behind else None
         self.simulated_missions = []
         self.primary_mission = None
+        self.airspace_version = 0  # Bumped on every airspace_data assignment
+        self._airspace_hash = None  # (missions list, content hash) of the last airspace hashed
         self.airspace_data = []  # This should only contain active missions from simulated_missions
         self.conflicted_missions = []
+        self.conflict_points = []  # Precomputed conflict points from the last check_conflicts run
+        self.shared_airspace = SharedAirspace()
+        # Set to a ConflictResultCache to reuse results across sessions (the GUI does)
+        self.conflict_cache = None
+        self._shared_airspace_version = None
+        self._shared_airspace_lock = threading.Lock()
+        self._process_pool = None
         self.simulated_missions_file = "simulated_missions.csv"
         self.airspace_data_file = "airspace_data.csv"
-        
+        self.mission_history_file = "mission_history.csv"  # Cold archive of completed missions
+        self.stress_primaries_file = "stress_primaries.csv"
+        self.stress_ground_truth_file = "stress_ground_truth.json"
+        self.archived_missions = 0
+        
+    @property
+    def airspace_data(self):
+        return self._airspace_data
+    
+    @airspace_data.setter
+    def airspace_data(self, missions):
+        self._airspace_data = missions
+        self.airspace_version += 1
+    
     def reset_all_data(self):
         """Reset all data and delete CSV files"""
         self.simulated_missions = []
         self.primary_mission = None
         self.airspace_data = []
         self.conflicted_missions = []
+        self.conflict_points = []
+        self.archived_missions = 0
+        
+        # Pending writes would recreate the files we are about to delete
+        if self.persistence is not None:
+            self.persistence.discard()
         
         # Delete CSV files if they exist
         try:
@@ -43,6 +774,14 @@ class DroneConflictDetectionSystem:
                 os.remove(self.simulated_missions_file)
             if os.path.exists(self.airspace_data_file):
                 os.remove(self.airspace_data_file)
+            if os.path.exists(self.mission_history_file):
+                os.remove(self.mission_history_file)
+            if os.path.exists(self.stress_primaries_file):
+                os.remove(self.stress_primaries_file)
+            if os.path.exists(self.stress_ground_truth_file):
+                os.remove(self.stress_ground_truth_file)
+            if self.conflict_cache is not None:
+                self.conflict_cache.clear()
             if os.path.exists("primary_mission.csv"):
                 os.remove("primary_mission.csv")
             if os.path.exists("high_conflict_primary.csv"):
@@ -51,31 +790,33 @@ class DroneConflictDetectionSystem:
         except Exception as e:
             print(f"Error deleting files: {e}")
         
-    def generate_simulated_missions(self, num_missions=1000, save_to_csv=True):
-        """Generate 1000 simulated drone missions"""
+    def generate_simulated_missions(self, num_missions=1000, save_to_csv=True, rng=None):
+        """Generate 1000 simulated drone missions, drawing from rng (a random.Random) if given"""
+        rng = rng or random
         missions = []
         
         for i in range(num_missions):
             mission_id = f"SIM_{i+1:04d}"
-            start_time = datetime.now() + timedelta(hours=random.randint(0, 24))
-            duration = timedelta(minutes=random.randint(30, 180))
+            start_time = datetime.now() + timedelta(hours=rng.randint(0, 24))
+            duration = timedelta(minutes=rng.randint(30, 180))
             
             # Generate random waypoints
-            num_waypoints = random.randint(3, 8)
+            num_waypoints = rng.randint(3, 8)
             waypoints = []
             
-            start_x = random.uniform(-1000, 1000)
-            start_y = random.uniform(-1000, 1000)
-            start_z = random.uniform(50, 500)
+            start_x = rng.uniform(-1000, 1000)
+            start_y = rng.uniform(-1000, 1000)
+            start_z = rng.uniform(50, 500)
             
             for j in range(num_waypoints):
-                x = start_x + random.uniform(-500, 500)
-                y = start_y + random.uniform(-500, 500)
-                z = max(50, start_z + random.uniform(-100, 100))
+                x = start_x + rng.uniform(-500, 500)
+                y = start_y + rng.uniform(-500, 500)
+                z = max(50, start_z + rng.uniform(-100, 100))
                 t = start_time + timedelta(minutes=j * duration.total_seconds() / 60 / num_waypoints)
                 waypoints.append((x, y, z, t))
             
-            mission = DroneMission(mission_id, waypoints, start_time, duration, "active")
+            mission = DroneMission(mission_id, waypoints, start_time, duration, "active",
+                                   coordinate_dtype=self.coordinate_dtype)
             missions.append(mission)
         
         self.simulated_missions = missions
@@ -84,9 +825,9 @@ class DroneConflictDetectionSystem:
         
         if save_to_csv:
             # Save to simulated_missions.csv
-            self.save_missions_to_csv(self.simulated_missions, self.simulated_missions_file)
+            self.persist_missions(self.simulated_missions, self.simulated_missions_file)
             # Save active missions to airspace_data.csv
-            self.save_missions_to_csv(self.airspace_data, self.airspace_data_file)
+            self.persist_missions(self.airspace_data, self.airspace_data_file)
         
         return missions
 
@@ -135,10 +876,156 @@ class DroneConflictDetectionSystem:
         waypoints.sort(key=lambda wp: wp[3])
         
         self.primary_mission = DroneMission(primary_id, waypoints, start_time, duration, "pending")
-        self.save_missions_to_csv([self.primary_mission], "high_conflict_primary.csv")
+        self.persist_missions([self.primary_mission], "high_conflict_primary.csv")
         
         return self.primary_mission
     
+    def generate_stress_scenario(self, num_conflicts=5000, near_miss_ratio=1.0, num_primaries=10,
+                                 background_missions=0, safety_distance=100, time_threshold=60,
+                                 waypoints_per_mission=5, seed=None, save_to_csv=True):
+        """Generate a large airspace with a known set of conflicts for stress testing.
+
+        Each primary flies a straight line in its own 20 km cell with waypoints
+        4 x safety_distance apart. Every conflict mission puts one waypoint inside
+        the safety envelope of a primary waypoint; near-miss missions put it just
+        outside in distance or in time (1.05x to 1.5x the threshold). All other
+        waypoints, and any background missions, fly well above the primaries'
+        altitude band. By construction the expected conflicts are exact, and they
+        are returned (and saved to stress_ground_truth_file) together with the
+        primaries. The primaries are not added to the airspace; the first one
+        becomes primary_mission.
+        """
+        rng = np.random.default_rng(seed)
+        now = to_epoch_seconds(datetime.now())
+        num_near_misses = int(round(num_conflicts * near_miss_ratio))
+        primary_waypoints = 8
+        spacing = 4 * safety_distance
+        floor = MIN_ALTITUDE + 2 * safety_distance
+        high_band = floor + 300 + 10 * safety_distance  # Far above every primary waypoint
+        
+        # Primaries: straight lines along x, one per grid cell
+        cells = int(np.ceil(np.sqrt(num_primaries)))
+        cell_size = max(20000, 3 * primary_waypoints * spacing)
+        cell_index = np.arange(num_primaries)
+        origins = np.column_stack([(cell_index % cells) * cell_size, (cell_index // cells) * cell_size])
+        primary_starts = now + 3600 + rng.uniform(0, 6 * 3600, num_primaries)
+        primary_legs = rng.uniform(120, 600, (num_primaries, primary_waypoints - 1))
+        primary_array = np.empty((num_primaries, primary_waypoints, 4))
+        primary_array[:, :, 0] = origins[:, None, 0] + np.arange(primary_waypoints) * spacing
+        primary_array[:, :, 1] = origins[:, None, 1]
+        primary_array[:, :, 2] = rng.uniform(floor, floor + 300, (num_primaries, primary_waypoints))
+        primary_array[:, :, 3] = primary_starts[:, None] + np.concatenate(
+            [np.zeros((num_primaries, 1)), np.cumsum(primary_legs, axis=1)], axis=1)
+        primaries = [DroneMission(f"STRESS_PRIMARY_{i+1:03d}", primary_array[i], primary_starts[i],
+                                  primary_array[i, -1, 3] - primary_starts[i], "pending",
+                                  coordinate_dtype=self.coordinate_dtype)
+                     for i in range(num_primaries)]
+        
+        # Target waypoint of every conflict / near-miss mission relative to a primary waypoint
+        total = num_conflicts + num_near_misses
+        owner = rng.integers(0, num_primaries, total)
+        anchor = primary_array[owner, rng.integers(0, primary_waypoints, total)]
+        is_conflict = np.arange(total) < num_conflicts
+        spatial_near_miss = ~is_conflict & (rng.random(total) < 0.5)
+        temporal_near_miss = ~is_conflict & ~spatial_near_miss
+        
+        radius = safety_distance * 0.95 * rng.random(total) ** (1 / 3)  # Uniform inside the sphere
+        radius[spatial_near_miss] = safety_distance * rng.uniform(1.05, 1.5, spatial_near_miss.sum())
+        time_offset = time_threshold * rng.uniform(-0.95, 0.95, total)
+        time_offset[temporal_near_miss] = (time_threshold * rng.uniform(1.05, 1.5, temporal_near_miss.sum())
+                                           * rng.choice([-1, 1], temporal_near_miss.sum()))
+        direction = rng.normal(size=(total, 3))
+        direction /= np.linalg.norm(direction, axis=1, keepdims=True)
+        target = np.column_stack([anchor[:, :3] + direction * radius[:, None], anchor[:, 3] + time_offset])
+        
+        # Remaining waypoints one minute apart, high above the primaries' altitude band
+        slot = rng.integers(0, waypoints_per_mission, total)
+        offsets = (np.arange(waypoints_per_mission)[None, :] - slot[:, None]) * 60.0
+        stress_array = np.empty((total, waypoints_per_mission, 4))
+        stress_array[:, :, :2] = target[:, None, :2] + rng.uniform(-200, 200, (total, waypoints_per_mission, 2))
+        stress_array[:, :, 2] = rng.uniform(high_band, high_band + 500, (total, waypoints_per_mission))
+        stress_array[:, :, 3] = target[:, None, 3] + offsets
+        stress_array[np.arange(total), slot] = target
+        
+        missions = []
+        expected = {p.mission_id: [] for p in primaries}
+        near_misses = {p.mission_id: [] for p in primaries}
+        for i in range(total):
+            prefix = "STRESS_CONFLICT" if is_conflict[i] else "STRESS_NEAR_MISS"
+            mission_id = f"{prefix}_{i+1:06d}"
+            start = stress_array[i, 0, 3]
+            missions.append(DroneMission(mission_id, stress_array[i], start, stress_array[i, -1, 3] - start,
+                                         "active", coordinate_dtype=self.coordinate_dtype))
+            (expected if is_conflict[i] else near_misses)[primaries[owner[i]].mission_id].append(mission_id)
+        
+        # Background traffic shares the area and time window but stays in the high band
+        if background_missions:
+            span_x = cells * cell_size
+            background = np.empty((background_missions, waypoints_per_mission, 4))
+            background[:, :, :2] = rng.uniform(0, span_x, (background_missions, 1, 2)) + rng.uniform(
+                -500, 500, (background_missions, waypoints_per_mission, 2))
+            background[:, :, 2] = rng.uniform(high_band, high_band + 500, (background_missions, waypoints_per_mission))
+            background[:, :, 3] = (now + rng.uniform(0, 8 * 3600, (background_missions, 1))
+                                   + np.arange(waypoints_per_mission) * 300.0)
+            for i in range(background_missions):
+                start = background[i, 0, 3]
+                missions.append(DroneMission(f"STRESS_BG_{i+1:06d}", background[i], start,
+                                             background[i, -1, 3] - start, "active",
+                                             coordinate_dtype=self.coordinate_dtype))
+        
+        self.simulated_missions = missions
+        self.airspace_data = list(missions)
+        self.conflicted_missions = []
+        self.conflict_points = []
+        self.primary_mission = primaries[0] if primaries else None
+        
+        scenario = {
+            'parameters': {
+                'num_conflicts': num_conflicts,
+                'near_miss_ratio': near_miss_ratio,
+                'num_primaries': num_primaries,
+                'background_missions': background_missions,
+                'safety_distance': safety_distance,
+                'time_threshold': time_threshold,
+                'seed': seed
+            },
+            'primaries': primaries,
+            'expected_conflicts': expected,
+            'near_misses': near_misses
+        }
+        
+        if save_to_csv:
+            self.persist_missions(self.simulated_missions, self.simulated_missions_file)
+            self.persist_missions(self.airspace_data, self.airspace_data_file)
+            self.persist_missions(primaries, self.stress_primaries_file)
+            with open(self.stress_ground_truth_file, "w") as f:
+                json.dump({k: v for k, v in scenario.items() if k != 'primaries'}, f)
+        
+        print(f"Stress scenario: {num_conflicts} conflicts, {num_near_misses} near misses, "
+              f"{num_primaries} primaries, {len(missions)} missions")
+        return scenario
+    
+    def verify_stress_scenario(self, scenario):
+        """Check every stress primary and compare the result with the ground truth"""
+        parameters = scenario['parameters']
+        results = []
+        for primary in scenario['primaries']:
+            started = time.perf_counter()
+            found = self.check_conflicts(primary, self.airspace_data, parameters['safety_distance'],
+                                         parameters['time_threshold'])
+            seconds = time.perf_counter() - started
+            found_ids = {m.mission_id for m in found}
+            expected_ids = set(scenario['expected_conflicts'][primary.mission_id])
+            results.append({
+                'mission_id': primary.mission_id,
+                'expected': len(expected_ids),
+                'found': len(found_ids),
+                'missing': sorted(expected_ids - found_ids),
+                'unexpected': sorted(found_ids - expected_ids),
+                'seconds': seconds
+            })
+        return results
+    
     def generate_primary_mission(self, save_to_csv=True):
         """Generate a normal primary mission for testing"""
         mission_id = "PRIMARY_" + datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -156,54 +1043,77 @@ class DroneConflictDetectionSystem:
         self.primary_mission = DroneMission(mission_id, waypoints, start_time, duration, "pending")
         
         if save_to_csv:
-            self.save_missions_to_csv([self.primary_mission], "primary_mission.csv")
+            self.persist_missions([self.primary_mission], "primary_mission.csv")
         
         return self.primary_mission
     
-    def save_missions_to_csv(self, missions, filename):
+    def persist_missions(self, missions, filename, append=False):
+        """Write missions to CSV, through the write-behind thread when enabled"""
+        if self.persistence is None:
+            self.save_missions_to_csv(missions, filename, append)
+        else:
+            self.persistence.submit(missions, filename, append)
+    
+    def flush(self, timeout=None):
+        """Wait until all queued CSV writes are on disk; False if one failed or timed out"""
+        if self.persistence is None:
+            return True
+        return self.persistence.flush(timeout)
+    
+    def save_missions_to_csv(self, missions, filename, append=False):
         """Save missions to CSV file with status information"""
-        data = []
-        for mission in missions:
-            for i, (x, y, z, t) in enumerate(mission.waypoints):
-                data.append({
-                    'mission_id': mission.mission_id,
-                    'waypoint_id': i+1,
-                    'x': x,
-                    'y': y,
-                    'z': z,
-                    'timestamp': t,
-                    'start_time': mission.start_time,
-                    'duration_minutes': mission.duration.total_seconds() / 60,
-                    'status': mission.status,
-                    'status_timestamp': mission.status_timestamp
-                })
-        
-        df = pd.DataFrame(data)
-        df.to_csv(filename, index=False)
+        arrays = [mission.waypoint_array() for mission in missions]
+        counts = np.array([len(a) for a in arrays], dtype=int)
+        waypoints = np.concatenate(arrays) if arrays else np.empty((0, 4))
+        # Per-mission waypoint numbering 1..n without a Python loop over waypoints
+        waypoint_ids = np.arange(len(waypoints)) - np.repeat(np.cumsum(counts) - counts, counts) + 1
+        
+        df = pd.DataFrame({
+            'mission_id': np.repeat([m.mission_id for m in missions], counts),
+            'waypoint_id': waypoint_ids,
+            'x': waypoints[:, 0],
+            'y': waypoints[:, 1],
+            'z': waypoints[:, 2],
+            'timestamp': pd.to_datetime(waypoints[:, 3], unit='s'),
+            'start_time': pd.to_datetime(np.repeat([m.start_epoch for m in missions], counts), unit='s'),
+            'duration_minutes': np.repeat([m.duration_seconds / 60 for m in missions], counts),
+            'status': np.repeat([m.status for m in missions], counts),
+            'status_timestamp': pd.to_datetime(np.repeat([m._status_ts for m in missions], counts), unit='s')
+        })
+        if append and os.path.exists(filename):
+            df.to_csv(filename, mode='a', header=False, index=False)
+        else:
+            # Write to a temp file and rename so readers never see a partial CSV
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filename)), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", newline="") as f:
+                    df.to_csv(f, index=False)
+                os.replace(temp_path, filename)
+            except BaseException:
+                os.remove(temp_path)
+                raise
         print(f"Missions saved to {filename}")
     
     def load_missions_from_csv(self, filename):
         """Load missions from CSV file with status information"""
         try:
-            df = pd.read_csv(filename)
+            # Round-trip parsing keeps reloaded coordinates bit-identical, which the
+            # content-hashed conflict cache relies on
+            df = pd.read_csv(filename, float_precision='round_trip')
+            epoch = pd.Timestamp(_EPOCH)
+            one_second = pd.Timedelta(seconds=1)
+            df['timestamp'] = (pd.to_datetime(df['timestamp']) - epoch) / one_second
+            df['start_time'] = (pd.to_datetime(df['start_time']) - epoch) / one_second
+            df['status_timestamp'] = (pd.to_datetime(df['status_timestamp']) - epoch) / one_second
             missions = []
             
-            for mission_id in df['mission_id'].unique():
-                mission_data = df[df['mission_id'] == mission_id]
-                waypoints = []
-                
-                for _, row in mission_data.iterrows():
-                    waypoints.append((
-                        row['x'], row['y'], row['z'], 
-                        pd.to_datetime(row['timestamp'])
-                    ))
+            for mission_id, mission_data in df.groupby('mission_id', sort=False):
+                waypoints = mission_data[['x', 'y', 'z', 'timestamp']].to_numpy(dtype=float)
+                first = mission_data.iloc[0]
                 
-                start_time = pd.to_datetime(mission_data['start_time'].iloc[0])
-                duration = timedelta(minutes=mission_data['duration_minutes'].iloc[0])
-                status = mission_data['status'].iloc[0]
-                status_timestamp = pd.to_datetime(mission_data['status_timestamp'].iloc[0])
-                
-                mission = DroneMission(mission_id, waypoints, start_time, duration, status, status_timestamp)
+                mission = DroneMission(mission_id, waypoints, first['start_time'],
+                                       first['duration_minutes'] * 60, normalize_status(first['status']),
+                                       first['status_timestamp'], coordinate_dtype=self.coordinate_dtype)
                 missions.append(mission)
             
             return missions
@@ -213,55 +1123,467 @@ class DroneConflictDetectionSystem:
     
     def update_simulated_missions_csv(self):
         """Update the simulated missions CSV file with current status"""
-        self.save_missions_to_csv(self.simulated_missions, self.simulated_missions_file)
+        self.persist_missions(self.simulated_missions, self.simulated_missions_file)
         print("Simulated missions CSV updated with current status")
     
     def update_airspace_data_csv(self):
         """Update the airspace data CSV file with only active missions from simulated_missions"""
         active_missions = [m for m in self.simulated_missions if m.status == "active"]
         self.airspace_data = active_missions  # Keep airspace_data in sync
-        self.save_missions_to_csv(active_missions, self.airspace_data_file)
+        self.persist_missions(active_missions, self.airspace_data_file)
         print("Airspace data CSV updated with active missions only")
     
-    def check_conflicts(self, primary_mission, test_missions, safety_distance=100, time_threshold=60):
-        """Check for conflicts between primary mission and test missions"""
-        conflicted_missions = []
+    def complete_expired_missions(self, now=None, save_to_csv=True):
+        """Complete active missions whose flight window has ended and archive them.
+
+        Completed missions are evicted from simulated_missions and airspace_data and
+        appended to the mission history file, so the working set only holds missions
+        that are still flying or scheduled.
+        """
+        now = now or datetime.now()
+        now_epoch = to_epoch_seconds(now)
+        for mission in self.simulated_missions:
+            if mission.status == "active" and mission.end_epoch < now_epoch:
+                mission.status = "completed"
+                mission.status_timestamp = now
+                mission.conflict = False
         
+        completed = [m for m in self.simulated_missions if m.status == "completed"]
+        if not completed:
+            return []
+        
+        self.simulated_missions = [m for m in self.simulated_missions if m.status != "completed"]
+        self.airspace_data = [m for m in self.airspace_data if m.status == "active"]
+        self.conflicted_missions = [m for m in self.conflicted_missions if m.status != "completed"]
+        remaining_ids = {m.mission_id for m in self.conflicted_missions}
+        self.conflict_points = [p for p in self.conflict_points if p['mission_id'] in remaining_ids]
+        self.archived_missions += len(completed)
+        
+        if save_to_csv:
+            # Archive first so a failed rewrite never loses missions
+            self.persist_missions(completed, self.mission_history_file, append=True)
+            self.update_simulated_missions_csv()
+            self.update_airspace_data_csv()
+        
+        print(f"{len(completed)} expired missions completed and archived")
+        return completed
+    
+    def count_archived_missions(self):
+        """Count missions stored in the mission history file"""
+        if not os.path.exists(self.mission_history_file):
+            return 0
+        try:
+            # Generated ids repeat across runs, so count each archived row block once
+            return int((pd.read_csv(self.mission_history_file, usecols=['waypoint_id'])['waypoint_id'] == 1).sum())
+        except Exception as e:
+            print(f"Error reading mission history: {e}")
+            return 0
+    
+    def resolve_severity_bands(self, safety_distance=100, time_threshold=60, severity_bands=None):
+        """Return absolute (severity, max_distance, max_time) bands, least severe first"""
+        if severity_bands is None:
+            severity_bands = [(name, safety_distance * dist_factor, time_threshold * time_factor)
+                              for name, dist_factor, time_factor in DEFAULT_SEVERITY_BANDS]
+        for name, _, _ in severity_bands:
+            if name not in SEVERITY_LEVELS[1:]:
+                raise ValueError(f"Unknown severity band: {name}")
+        # Loosest band comes first so tighter bands overwrite it during evaluation
+        return sorted(severity_bands, key=lambda band: SEVERITY_LEVELS.index(band[0]))
+
+    def check_conflicts(self, primary_mission, test_missions, safety_distance=100, time_threshold=60,
+                        severity_bands=None):
+        """Check for conflicts between primary mission and test missions.
+
+        All primary/test waypoint pairs are evaluated in one vectorized pass. Each test
+        mission gets its worst severity in ``mission.severity`` and the waypoints that fell
+        inside a band in ``mission.conflict_points``; the flattened list is kept in
+        ``self.conflict_points``. ``severity_bands`` is a list of (severity, max_distance,
+        max_time) tuples; by default the bands are scaled from safety_distance and
+        time_threshold so that "moderate" is the plain conflict envelope.
+        """
+        bands = self.resolve_severity_bands(safety_distance, time_threshold, severity_bands)
+        candidates = []
         for test_mission in test_missions:
             if test_mission.status == "aborted" or test_mission.status == "inactive":
                 continue
-                
-            conflict_found = False
+            test_mission.conflict = False
+            test_mission.severity = "safe"
+            test_mission.conflict_points = ()
+            if test_mission.num_waypoints:
+                candidates.append(test_mission)
+        
+        cache_key = None
+        if self.conflict_cache is not None:
+            cache_key = self.conflict_cache_key(primary_mission, test_missions, bands)
+            cached = self.conflict_cache.get(cache_key)
+            if cached is not None:
+                return self._restore_conflict_results(candidates, cached)
+        
+        primary = primary_mission.waypoint_array()
+        if candidates and len(primary):
+            # Cheap reject: drop missions whose inflated 4D box misses the primary's box
+            overlap = boxes_overlap(primary_mission.bounding_box(), mission_boxes(candidates),
+                                    max(band[1] for band in bands), max(band[2] for band in bands))
+            candidates = [m for m, keep in zip(candidates, overlap) if keep]
+        
+        if candidates and len(primary):
+            test_arrays = [m.waypoint_array() for m in candidates]
+            counts = np.array([len(a) for a in test_arrays])
+            test = np.concatenate(test_arrays)
+            self._apply_conflict_results(candidates, counts, test, *evaluate_conflict_levels(primary, test, bands))
+        else:
+            self.conflicted_missions = []
+            self.conflict_points = []
+        
+        if cache_key is not None:
+            self.conflict_cache.put(cache_key, self._conflict_results_record())
+        return self.conflicted_missions
+    
+    def conflict_cache_key(self, primary_mission, test_missions, bands):
+        """Cache key from the content hashes of the primary, the airspace snapshot and the bands"""
+        key = hashlib.sha256()
+        key.update(mission_content_hash([primary_mission]).encode())
+        key.update(self.airspace_content_hash(test_missions).encode())
+        key.update(json.dumps([[name, float(d), float(t)] for name, d, t in bands]).encode())
+        return key.hexdigest()
+    
+    def airspace_content_hash(self, missions):
+        """Content hash of a mission list, reused while the same list is checked again.
+
+        airspace_data and shared snapshots are replaced on every change rather than
+        edited in place, so list identity stands in for the airspace version and a
+        repeated check only hashes the primary mission.
+        """
+        memo = self._airspace_hash
+        if memo is None or memo[0] is not missions:
+            memo = self._airspace_hash = (missions, mission_content_hash(missions))
+        return memo[1]
+    
+    def _conflict_results_record(self):
+        """Serializable form of the last conflict check for the result cache"""
+        return {
+            'conflicts': [[str(m.mission_id), m.severity] for m in self.conflicted_missions],
+            'points': [{**point, 'mission_id': str(point['mission_id']),
+                        **{k: float(point[k]) for k in ('x', 'y', 'z', 'distance', 'time_diff')}}
+                       for point in self.conflict_points]
+        }
+    
+    def _restore_conflict_results(self, missions, record):
+        """Apply a cached conflict check record to the given missions"""
+        by_id = {str(m.mission_id): m for m in missions}
+        conflicted_missions = []
+        for mission_id, severity in record['conflicts']:
+            mission = by_id[mission_id]
+            mission.conflict = True
+            mission.severity = severity
+            mission.conflict_points = []
+            conflicted_missions.append(mission)
+        
+        conflict_points = []
+        for point in record['points']:
+            mission = by_id[point['mission_id']]
+            mission.conflict_points.append((point['x'], point['y'], point['z']))
+            conflict_points.append({**point, 'mission_id': mission.mission_id})
+        
+        print(f"Conflict results loaded from cache: {len(conflicted_missions)} conflicts")
+        self.conflicted_missions = conflicted_missions
+        self.conflict_points = conflict_points
+        return conflicted_missions
+    
+    def _apply_conflict_results(self, candidates, counts, test, waypoint_levels, hit_distance, hit_time):
+        """Record per-waypoint conflict levels on the candidate missions"""
+        conflicted_missions = []
+        conflict_points = []
+        
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        mission_levels = np.zeros(len(candidates), dtype=np.int8)
+        nonempty = counts > 0
+        mission_levels[nonempty] = np.maximum.reduceat(waypoint_levels, offsets[:-1][nonempty])
+        
+        for idx in np.flatnonzero(mission_levels):
+            test_mission = candidates[idx]
+            test_mission.conflict = True
+            test_mission.severity = SEVERITY_LEVELS[mission_levels[idx]]
+            test_mission.conflict_points = []
             
-            # Simple conflict detection based on spatio-temporal proximity
-            for primary_wp in primary_mission.waypoints:
-                px, py, pz, pt = primary_wp
-                
-                for test_wp in test_mission.waypoints:
-                    tx, ty, tz, tt = test_wp
-                    
-                    # Check time proximity
-                    time_diff = abs((pt - tt).total_seconds())
-                    
-                    if time_diff <= time_threshold:
-                        # Check spatial proximity
-                        distance = np.sqrt((px - tx)**2 + (py - ty)**2 + (pz - tz)**2)
-                        
-                        if distance <= safety_distance:
-                            conflict_found = True
-                            print(f"CONFLICT: {test_mission.mission_id} - Distance: {distance:.2f}m, Time diff: {time_diff:.2f}s")
-                            break
-                
-                if conflict_found:
-                    break
+            first, last = offsets[idx], offsets[idx + 1]
+            hit_cols = first + np.flatnonzero(waypoint_levels[first:last])
+            for col in hit_cols:
+                x, y, z = test[col, :3]
+                point = {
+                    'mission_id': test_mission.mission_id,
+                    'x': x,
+                    'y': y,
+                    'z': z,
+                    'distance': hit_distance[col],
+                    'time_diff': hit_time[col],
+                    'severity': SEVERITY_LEVELS[waypoint_levels[col]]
+                }
+                test_mission.conflict_points.append((x, y, z))
+                conflict_points.append(point)
             
-            if conflict_found:
-                test_mission.conflict = True
-                conflicted_missions.append(test_mission)
+            min_distance = hit_distance[hit_cols].min()
+            print(f"CONFLICT ({test_mission.severity}): {test_mission.mission_id} - Min distance: {min_distance:.2f}m")
+            conflicted_missions.append(test_mission)
         
         self.conflicted_missions = conflicted_missions
+        self.conflict_points = conflict_points
         return conflicted_missions
     
+    def plan_mission_acceptance(self, candidates, priority=None, safety_distance=100, time_threshold=60,
+                                severity_bands=None, save_to_csv=True):
+        """Accept or reject candidate missions one after another in a single pass.
+
+        Candidates are processed in the given order, or sorted by ``priority`` (a key
+        function, lowest first). Each one is checked against the active airspace plus
+        the candidates accepted before it; accepted missions go into the live index
+        straight away and the CSV files are written once at the end. Returns the plan
+        as a list of dicts with mission_id, decision, severity and conflicts_with.
+        """
+        bands = self.resolve_severity_bands(safety_distance, time_threshold, severity_bands)
+        max_time = max(band[2] for band in bands)
+        ordered = sorted(candidates, key=priority) if priority else list(candidates)
+        
+        index = LiveAirspaceIndex(m for m in self.simulated_missions if m.status == "active")
+        now = datetime.now()
+        plan = []
+        
+        for candidate in ordered:
+            primary = candidate.waypoint_array()
+            conflicts_with = []
+            level = 0
+            if len(primary):
+                waypoints, owners = index.query(primary[:, 3].min() - max_time, primary[:, 3].max() + max_time)
+                waypoint_levels = evaluate_conflict_levels(primary, waypoints, bands)[0]
+                if waypoint_levels.any():
+                    level = waypoint_levels.max()
+                    conflicts_with = [index.missions[i].mission_id for i in np.unique(owners[waypoint_levels > 0])]
+            
+            candidate.status = "inactive" if level else "active"
+            candidate.status_timestamp = now
+            candidate.severity = SEVERITY_LEVELS[level]
+            if not level:
+                index.insert(candidate)
+            self.simulated_missions.append(candidate)
+            plan.append({
+                'mission_id': candidate.mission_id,
+                'decision': "rejected" if level else "accepted",
+                'severity': SEVERITY_LEVELS[level],
+                'conflicts_with': conflicts_with
+            })
+        
+        accepted = sum(1 for entry in plan if entry['decision'] == "accepted")
+        print(f"Acceptance plan: {accepted} accepted, {len(plan) - accepted} rejected")
+        
+        if save_to_csv:
+            self.update_simulated_missions_csv()
+            self.update_airspace_data_csv()
+        else:
+            self.airspace_data = [m for m in self.simulated_missions if m.status == "active"]
+        return plan
+    
+    def sweep_conflict_thresholds(self, primary_mission, test_missions=None, safety_distances=None,
+                                  time_thresholds=None):
+        """Count conflicts for every safety_distance x time_threshold combination in one pass.
+
+        For each mission pair the closest approach within each time threshold is
+        computed once; a combination conflicts when that distance is within the
+        safety distance. Returns a dict with a ``counts`` DataFrame (time thresholds x
+        safety distances) and a ``missions`` DataFrame of per-mission minimum
+        distance, minimum time gap and closest approach per time threshold for the
+        missions inside the widest envelope. Mission conflict state is left untouched.
+        """
+        safety_distances = sorted(SWEEP_SAFETY_DISTANCES if safety_distances is None else safety_distances)
+        time_thresholds = sorted(SWEEP_TIME_THRESHOLDS if time_thresholds is None else time_thresholds)
+        if test_missions is None:
+            test_missions = [m for m in self.simulated_missions if m.status == "active"]
+        
+        candidates = [m for m in test_missions if m.status not in ("aborted", "inactive") and m.num_waypoints]
+        primary = primary_mission.waypoint_array()
+        if candidates and len(primary):
+            overlap = boxes_overlap(primary_mission.bounding_box(), mission_boxes(candidates),
+                                    safety_distances[-1], time_thresholds[-1])
+            candidates = [m for m, keep in zip(candidates, overlap) if keep]
+        
+        closest = np.full((len(candidates), len(time_thresholds)), np.inf)
+        min_distance = np.full(len(candidates), np.inf)
+        min_time_gap = np.full(len(candidates), np.inf)
+        if candidates and len(primary):
+            test_arrays = [m.waypoint_array() for m in candidates]
+            starts = np.concatenate(([0], np.cumsum([len(a) for a in test_arrays])[:-1]))
+            by_time, waypoint_distance, waypoint_time_gap = minimum_distances_by_time(
+                primary, np.concatenate(test_arrays), time_thresholds)
+            closest = np.minimum.reduceat(by_time, starts, axis=0)
+            min_distance = np.minimum.reduceat(waypoint_distance, starts)
+            min_time_gap = np.minimum.reduceat(waypoint_time_gap, starts)
+        
+        counts = pd.DataFrame(
+            [[int((closest[:, i] <= d).sum()) for d in safety_distances] for i in range(len(time_thresholds))],
+            index=pd.Index(time_thresholds, name='time_threshold_s'),
+            columns=pd.Index(safety_distances, name='safety_distance_m'))
+        missions = pd.DataFrame({
+            'mission_id': [m.mission_id for m in candidates],
+            'min_distance_m': min_distance,
+            'min_time_gap_s': min_time_gap,
+            **{f'closest_within_{t}s_m': closest[:, i] for i, t in enumerate(time_thresholds)}
+        })
+        return {'counts': counts, 'missions': missions}
+    
+    def suggest_resolution(self, primary_mission, test_missions=None, safety_distance=100, time_threshold=60,
+                           severity_bands=None, time_shifts=None, altitude_offsets=None):
+        """Find the smallest departure shift / altitude offset that clears all conflicts.
+
+        Every (time shift, altitude offset) variant of the primary mission is evaluated
+        at once as a broadcast array operation against the waypoint pairs that could
+        come within range under any variant. The cost of a variant is
+        |shift| + RESOLUTION_SECONDS_PER_METER * |offset|. Returns a dict with
+        time_shift (seconds), altitude_offset (m), cost and search counts, or None if
+        no variant in the grid is conflict free.
+        """
+        bands = self.resolve_severity_bands(safety_distance, time_threshold, severity_bands)
+        time_shifts = np.asarray(RESOLUTION_TIME_SHIFTS if time_shifts is None else time_shifts, dtype=float)
+        altitude_offsets = np.asarray(RESOLUTION_ALTITUDE_OFFSETS if altitude_offsets is None else altitude_offsets,
+                                      dtype=float)
+        if test_missions is None:
+            test_missions = [m for m in self.simulated_missions if m.status == "active"]
+        
+        primary = primary_mission.waypoint_array()
+        if len(primary) == 0:
+            return None
+        max_distance = max(band[1] for band in bands)
+        max_time = max(band[2] for band in bands)
+        max_shift = np.abs(time_shifts).max()
+        max_offset = np.abs(altitude_offsets).max()
+        
+        # Only waypoint pairs that some variant could bring within range matter
+        test_missions = [m for m in test_missions if m.status not in ("aborted", "inactive")]
+        overlap = boxes_overlap(primary_mission.bounding_box(), mission_boxes(test_missions),
+                                max_distance + max_offset, max_time + max_shift)
+        arrays = [m.waypoint_array() for m, keep in zip(test_missions, overlap) if keep]
+        test = np.concatenate(arrays) if arrays else np.empty((0, 4))
+        gaps, horizontals, verticals = [np.empty(0)], [np.empty(0)], [np.empty(0)]
+        chunk = max(1, CONFLICT_CHUNK_PAIRS // len(primary))
+        for start in range(0, len(test), chunk):
+            block = test[start:start + chunk]
+            # (primary waypoints x test waypoints), reduced to the reachable pairs
+            time_gap = block[None, :, 3] - primary[:, 3, None]
+            horizontal = ((primary[:, None, :2] - block[None, :, :2]) ** 2).sum(axis=2)
+            vertical = block[None, :, 2] - primary[:, 2, None]
+            reachable = ((np.abs(time_gap) <= max_time + max_shift)
+                         & (horizontal <= max_distance ** 2)
+                         & (np.abs(vertical) <= max_distance + max_offset))
+            gaps.append(time_gap[reachable])
+            horizontals.append(horizontal[reachable])
+            verticals.append(vertical[reachable])
+        time_gap, horizontal, vertical = np.concatenate(gaps), np.concatenate(horizontals), np.concatenate(verticals)
+        
+        # Variant grid flattened to (shift, offset) pairs, excluding altitudes below the floor
+        shift_grid, offset_grid = np.meshgrid(time_shifts, altitude_offsets, indexing='ij')
+        shift_grid, offset_grid = shift_grid.ravel(), offset_grid.ravel()
+        valid = primary[:, 2].min() + offset_grid >= MIN_ALTITUDE
+        shift_grid, offset_grid = shift_grid[valid], offset_grid[valid]
+        
+        conflicted = np.zeros(len(shift_grid), dtype=bool)
+        chunk = max(1, CONFLICT_CHUNK_PAIRS // max(len(time_gap), 1))
+        for start in range(0, len(shift_grid), chunk):
+            shifts = shift_grid[start:start + chunk, None]
+            offsets = offset_grid[start:start + chunk, None]
+            # (variants x reachable pairs)
+            dt = np.abs(time_gap[None, :] - shifts)
+            distance_sq = horizontal[None, :] + (vertical[None, :] - offsets) ** 2
+            for _, band_distance, band_time in bands:
+                conflicted[start:start + chunk] |= ((dt <= band_time) & (distance_sq <= band_distance ** 2)).any(axis=1)
+        
+        clear = np.flatnonzero(~conflicted)
+        if len(clear) == 0:
+            print(f"No conflict-free resolution among {len(shift_grid)} variants")
+            return None
+        
+        cost = np.abs(shift_grid[clear]) + RESOLUTION_SECONDS_PER_METER * np.abs(offset_grid[clear])
+        best = clear[np.argmin(cost)]
+        return {
+            'time_shift': float(shift_grid[best]),
+            'altitude_offset': float(offset_grid[best]),
+            'cost': float(cost.min()),
+            'variants_evaluated': len(shift_grid),
+            'clear_variants': len(clear)
+        }
+    
+    def apply_resolution(self, mission, resolution):
+        """Shift a mission's departure time and altitude by a suggest_resolution result"""
+        waypoints = mission.waypoint_array().copy()
+        waypoints[:, 2] += resolution['altitude_offset']
+        waypoints[:, 3] += resolution['time_shift']
+        mission.start_time = mission.start_epoch + resolution['time_shift']
+        mission.waypoints = waypoints
+        return mission
+    
+    def acquire_shared_airspace(self):
+        """Pin a shared memory snapshot of airspace_data, publishing a new version if it changed"""
+        with self._shared_airspace_lock:
+            if self._shared_airspace_version != self.airspace_version:
+                self._shared_airspace_version = self.airspace_version
+                self.shared_airspace.publish(self.airspace_data)
+            return self.shared_airspace.acquire()
+    
+    def check_conflicts_parallel(self, primary_mission, safety_distance=100, time_threshold=60,
+                                 severity_bands=None, workers=None):
+        """Check the primary mission against airspace_data in worker processes.
+
+        Workers attach zero-copy to the shared memory snapshot, so only the primary
+        waypoints and a mission range are sent per task. Results match check_conflicts.
+        """
+        bands = self.resolve_severity_bands(safety_distance, time_threshold, severity_bands)
+        descriptor, missions, offsets, waypoints = self.acquire_shared_airspace()
+        try:
+            for mission in missions:
+                mission.conflict = False
+                mission.severity = "safe"
+                mission.conflict_points = ()
+            
+            cache_key = None
+            if self.conflict_cache is not None:
+                cache_key = self.conflict_cache_key(primary_mission, missions, bands)
+                cached = self.conflict_cache.get(cache_key)
+                if cached is not None:
+                    return self._restore_conflict_results(missions, cached)
+            
+            primary = primary_mission.waypoint_array()
+            if not missions or len(primary) == 0:
+                self.conflicted_missions = []
+                self.conflict_points = []
+                return []
+            
+            workers = workers or os.cpu_count() or 1
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=workers)
+            
+            bounds = np.unique(np.linspace(0, len(missions), workers * 4 + 1).astype(int))
+            futures = [self._process_pool.submit(_check_conflicts_chunk, descriptor, primary, bands, first, last)
+                       for first, last in zip(bounds[:-1], bounds[1:])]
+            results = [future.result() for future in futures]
+            
+            self._apply_conflict_results(missions, np.diff(offsets), waypoints,
+                                         *(np.concatenate(parts) for parts in zip(*results)))
+            if cache_key is not None:
+                self.conflict_cache.put(cache_key, self._conflict_results_record())
+            return self.conflicted_missions
+        finally:
+            del offsets, waypoints
+            self.shared_airspace.release(descriptor)
+    
+    def shutdown(self):
+        """Flush pending writes, stop worker processes and unlink shared memory snapshots"""
+        self.flush()
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+            self._process_pool = None
+        for shm, *_ in _attached_airspace.values():
+            shm.close()
+        _attached_airspace.clear()
+        self.shared_airspace.close()
+        self._shared_airspace_version = None
+    
     def abort_mission(self, mission_id):
         """Abort a specific mission and update CSVs"""
         mission_found = False
@@ -272,6 +1594,8 @@ class DroneConflictDetectionSystem:
                 mission.status = "aborted"
                 mission.status_timestamp = datetime.now()
                 mission.conflict = False
+                mission.severity = "safe"
+                mission.conflict_points = ()
                 mission_found = True
                 print(f"Mission {mission_id} aborted at {mission.status_timestamp}")
                 break
@@ -300,6 +1624,7 @@ class DroneConflictDetectionSystem:
         
         # Clear the conflicted missions list after aborting
         self.conflicted_missions = []
+        self.conflict_points = []
         print(f"All {aborted_count} conflicted missions aborted")
         return aborted_count
     
@@ -341,7 +1666,9 @@ class DroneConflictDetectionSystem:
         active_missions = len([m for m in self.simulated_missions if m.status == "active"])
         aborted_missions = len([m for m in self.simulated_missions if m.status == "aborted"])
         inactive_missions = len([m for m in self.simulated_missions if m.status == "inactive"])
-        completed_missions = len([m for m in self.simulated_missions if m.status == "completed"])
+        # Completed missions are archived out of simulated_missions
+        completed_missions = (len([m for m in self.simulated_missions if m.status == "completed"])
+                              + self.archived_missions)
         
         # Airspace missions should be the same as active missions in simulated_missions
         airspace_missions = len(self.airspace_data)
@@ -352,11 +1679,234 @@ class DroneConflictDetectionSystem:
             'aborted_missions': aborted_missions,
             'inactive_missions': inactive_missions,
             'completed_missions': completed_missions,
+            'archived_missions': self.archived_missions,
+            'persistence': self.persistence.stats() if self.persistence is not None else None,
             'airspace_missions': airspace_missions,
             'current_conflicts': len(self.conflicted_missions),
             'primary_mission': self.primary_mission.mission_id if self.primary_mission else None
         }
 
+def measure_mission_memory(num_missions=1_000_000, waypoints_per_mission=5, coordinate_dtype=np.float64):
+    """Build num_missions missions and report their traced memory footprint in bytes"""
+    rng = np.random.default_rng(0)
+    start = to_epoch_seconds(datetime.now())
+    
+    # Source data is allocated before tracing so only the mission objects are measured
+    starts = start + rng.integers(0, 24 * 3600, num_missions).astype(float)
+    durations = rng.integers(30, 180, num_missions) * 60.0
+    waypoints = np.empty((num_missions, waypoints_per_mission, 4))
+    waypoints[:, :, :3] = rng.uniform(-1000, 1000, (num_missions, waypoints_per_mission, 3))
+    waypoints[:, :, 3] = (starts[:, None]
+                          + np.arange(waypoints_per_mission) * durations[:, None] / waypoints_per_mission)
+    
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    missions = [DroneMission(f"SIM_{i+1:07d}", waypoints[i], starts[i], durations[i], "active", start,
+                             coordinate_dtype=coordinate_dtype)
+                for i in range(num_missions)]
+    # Conflict checks cache each mission's bounding box, so count it as resident
+    for mission in missions:
+        mission.bounding_box()
+    total_bytes = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    
+    total_waypoints = num_missions * waypoints_per_mission
+    waypoint_bytes = total_waypoints * 4 * np.dtype(coordinate_dtype).itemsize
+    return {
+        'num_missions': num_missions,
+        'waypoints_per_mission': waypoints_per_mission,
+        'coordinate_dtype': np.dtype(coordinate_dtype).name,
+        'total_bytes': total_bytes,
+        'bytes_per_mission': total_bytes / max(num_missions, 1),
+        'bytes_per_waypoint': total_bytes / max(total_waypoints, 1),
+        'waypoint_data_bytes_per_waypoint': waypoint_bytes / max(total_waypoints, 1),
+        'mission_overhead_bytes': (total_bytes - waypoint_bytes) / max(num_missions, 1)
+    }
+
+def print_memory_report(report):
+    """Print the result of measure_mission_memory"""
+    print(f"Missions: {report['num_missions']:,} x {report['waypoints_per_mission']} waypoints "
+          f"({report['coordinate_dtype']} coordinates)")
+    print(f"Total traced memory: {report['total_bytes'] / 1024**2:.1f} MiB")
+    print(f"Bytes per mission: {report['bytes_per_mission']:.1f} "
+          f"(of which {report['mission_overhead_bytes']:.1f} object overhead)")
+    print(f"Bytes per waypoint: {report['bytes_per_waypoint']:.1f} "
+          f"(raw waypoint data {report['waypoint_data_bytes_per_waypoint']:.1f})")
+
+# Default operator event mix for the load harness (relative weights)
+DEFAULT_EVENT_MIX = {"new_primary": 0.2, "check": 0.5, "abort": 0.15, "accept": 0.1, "reject": 0.05}
+
+def record_scenario(num_events=1000, airspace_size=1000, seed=0, mix=None, rate=None):
+    """Generate a deterministic operator traffic scenario.
+
+    Events carry everything needed to replay them: new primaries bring their own
+    waypoints (times relative to replay start) and aborts carry a uniform pick used
+    to choose an active mission as it stands at replay time. With ``rate``
+    (events per second) events get Poisson arrival times, otherwise they run
+    back to back.
+    """
+    mix = mix or DEFAULT_EVENT_MIX
+    ops = list(mix)
+    weights = np.array([mix[op] for op in ops], dtype=float)
+    rng = np.random.default_rng(seed)
+    
+    arrivals = (np.cumsum(rng.exponential(1.0 / rate, num_events)) if rate
+                else np.zeros(num_events))
+    events = []
+    for i, op in enumerate(rng.choice(ops, size=num_events, p=weights / weights.sum())):
+        event = {'time': float(arrivals[i]), 'op': str(op)}
+        if op == "new_primary":
+            num_waypoints = int(rng.integers(3, 9))
+            start = float(rng.integers(0, 24)) * 3600
+            duration = float(rng.integers(30, 181)) * 60
+            origin = rng.uniform([-1000, -1000, 50], [1000, 1000, 500])
+            xyz = origin + rng.uniform([-500, -500, -100], [500, 500, 100], (num_waypoints, 3))
+            xyz[:, 2] = np.maximum(xyz[:, 2], MIN_ALTITUDE)
+            times = start + np.arange(num_waypoints) * duration / num_waypoints
+            event['mission_id'] = f"LOAD_{i+1:06d}"
+            event['start'] = start
+            event['duration'] = duration
+            event['waypoints'] = np.column_stack([xyz, times]).tolist()
+        elif op == "abort":
+            event['pick'] = float(rng.random())
+        events.append(event)
+    
+    return {'seed': seed, 'airspace_size': airspace_size, 'rate': rate, 'events': events}
+
+def save_scenario(scenario, filename):
+    """Write a recorded scenario to a JSON file"""
+    with open(filename, "w") as f:
+        json.dump(scenario, f)
+
+def load_scenario(filename):
+    """Read a scenario written by save_scenario"""
+    with open(filename) as f:
+        return json.load(f)
+
+def replay_scenario(scenario, workdir=None, use_cache=False):
+    """Replay a scenario against a fresh headless system and report latencies.
+
+    The airspace is regenerated from the scenario seed and CSV files go to
+    ``workdir`` (a temporary directory by default). Under a paced scenario the
+    latency of an event is measured from its scheduled arrival, so queueing behind
+    a slow event shows up in the tail instead of being hidden. An abort rechecks the
+    primary mission afterwards, as the GUI does, so its latency includes that check.
+    An accept of a primary that was never checked is skipped, and accepts refused
+    because of conflicts are reported as ``accept_failed``.
+    """
+    temporary = workdir is None
+    workdir = workdir or tempfile.mkdtemp(prefix="dcs_load_")
+    dcs = DroneConflictDetectionSystem()
+    dcs.simulated_missions_file = os.path.join(workdir, "simulated_missions.csv")
+    dcs.airspace_data_file = os.path.join(workdir, "airspace_data.csv")
+    dcs.mission_history_file = os.path.join(workdir, "mission_history.csv")
+    dcs.conflict_cache = ConflictResultCache(os.path.join(workdir, "conflict_cache")) if use_cache else None
+    
+    dcs.generate_simulated_missions(scenario['airspace_size'], rng=random.Random(scenario['seed']))
+    dcs.flush()
+    
+    latencies = {}
+    skipped = {}
+    checked = False  # Whether the current primary has been checked since it arrived
+    paced = bool(scenario.get('rate'))
+    origin = to_epoch_seconds(datetime.now())
+    replay_start = time.perf_counter()
+    
+    for event in scenario['events']:
+        op = event['op']
+        scheduled = replay_start + event['time']
+        if paced:
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        
+        target = None
+        if op == "abort":
+            # Prefer missions still in conflict with the primary, like an operator would
+            pool = [m for m in dcs.conflicted_missions if m.status == "active"] or dcs.airspace_data
+            target = pool[int(event['pick'] * len(pool))].mission_id if pool else None
+        if ((op in ("check", "accept", "reject") and dcs.primary_mission is None)
+                or (op == "accept" and not checked) or (op == "abort" and target is None)):
+            skipped[op] = skipped.get(op, 0) + 1
+            continue
+        
+        started = time.perf_counter()
+        if op == "new_primary":
+            waypoints = np.array(event['waypoints'], dtype=float)
+            waypoints[:, 3] += origin
+            dcs.primary_mission = DroneMission(event['mission_id'], waypoints, origin + event['start'],
+                                               event['duration'], "pending")
+            dcs.conflicted_missions = []
+            checked = False
+        elif op == "check":
+            dcs.check_conflicts(dcs.primary_mission, dcs.airspace_data)
+            checked = True
+        elif op == "abort":
+            dcs.abort_mission(target)
+            if dcs.primary_mission is not None:
+                dcs.check_conflicts(dcs.primary_mission, dcs.airspace_data)
+                checked = True
+        elif op == "accept":
+            if dcs.accept_primary_mission():
+                dcs.primary_mission = None
+            else:
+                op = "accept_failed"
+        elif op == "reject":
+            dcs.reject_primary_mission()
+            dcs.primary_mission = None
+        finished = time.perf_counter()
+        latencies.setdefault(op, []).append(finished - (scheduled if paced else started))
+    
+    elapsed = time.perf_counter() - replay_start
+    flush_started = time.perf_counter()
+    dcs.flush()
+    flush_seconds = time.perf_counter() - flush_started
+    dcs.shutdown()
+    if temporary:
+        shutil.rmtree(workdir, ignore_errors=True)
+    
+    operations = {}
+    for op, values in latencies.items():
+        values_ms = np.array(values) * 1000
+        operations[op] = {
+            'count': len(values),
+            'p50_ms': float(np.percentile(values_ms, 50)),
+            'p95_ms': float(np.percentile(values_ms, 95)),
+            'p99_ms': float(np.percentile(values_ms, 99)),
+            'max_ms': float(values_ms.max())
+        }
+    completed = sum(len(values) for values in latencies.values())
+    return {
+        'events': len(scenario['events']),
+        'completed': completed,
+        'skipped': skipped,
+        'elapsed_seconds': elapsed,
+        'throughput_per_second': completed / elapsed if elapsed > 0 else 0.0,
+        'final_flush_seconds': flush_seconds,
+        'operations': operations
+    }
+
+def print_load_report(report):
+    """Print the result of replay_scenario"""
+    print(f"Events: {report['events']} | completed: {report['completed']} | "
+          f"skipped: {sum(report['skipped'].values())}")
+    print(f"Elapsed: {report['elapsed_seconds']:.2f} s | throughput: {report['throughput_per_second']:.1f} ops/s | "
+          f"final flush: {report['final_flush_seconds'] * 1000:.0f} ms")
+    print(f"{'operation':<14}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for op, values in sorted(report['operations'].items()):
+        print(f"{op:<14}{values['count']:>8}{values['p50_ms']:>10.2f}{values['p95_ms']:>10.2f}"
+              f"{values['p99_ms']:>10.2f}{values['max_ms']:>10.2f}")
+
+def parse_event_mix(text):
+    """Parse an event mix like 'check=0.5,abort=0.2' into a dict"""
+    mix = {}
+    for item in text.split(","):
+        op, _, weight = item.partition("=")
+        if op.strip() not in DEFAULT_EVENT_MIX:
+            raise ValueError(f"Unknown event type: {op}")
+        mix[op.strip()] = float(weight)
+    return mix
+
 class VisualizationWindow:
     def __init__(self, parent, dcs_system):
         self.parent = parent
@@ -440,7 +1990,7 @@ class VisualizationWindow:
             return
         
         # Plot primary mission
-        primary_waypoints = np.array([(wp[0], wp[1], wp[2]) for wp in self.dcs.primary_mission.waypoints])
+        primary_waypoints = self.dcs.primary_mission.waypoint_array()[:, :3]
         if len(primary_waypoints) > 0:
             self.ax.plot(primary_waypoints[:, 0], primary_waypoints[:, 1], primary_waypoints[:, 2], 
                         'ro-', linewidth=4, markersize=10, label='Primary Mission', alpha=0.8)
@@ -451,23 +2001,19 @@ class VisualizationWindow:
         
         # Find and plot nearby missions (within 500m of any primary waypoint)
         nearby_missions = []
-        for mission in self.dcs.simulated_missions:
-            if mission.status == "active":
-                for wp_primary in self.dcs.primary_mission.waypoints:
-                    for wp_mission in mission.waypoints:
-                        distance = np.sqrt((wp_primary[0]-wp_mission[0])**2 + 
-                                         (wp_primary[1]-wp_mission[1])**2 + 
-                                         (wp_primary[2]-wp_mission[2])**2)
-                        if distance < 500:  # Within 500m
-                            nearby_missions.append(mission)
-                            break
-                    else:
-                        continue
-                    break
+        active_missions = [m for m in self.dcs.simulated_missions if m.status == "active"]
+        # Box test first; time does not matter for the nearby view
+        overlap = boxes_overlap(self.dcs.primary_mission.bounding_box(), mission_boxes(active_missions), 500, np.inf)
+        for mission in (m for m, keep in zip(active_missions, overlap) if keep):
+            if mission.num_waypoints:
+                waypoints = mission.waypoint_array()[:, :3]
+                distances = np.sqrt(((primary_waypoints[:, None, :] - waypoints[None, :, :]) ** 2).sum(axis=2))
+                if (distances < 500).any():  # Within 500m
+                    nearby_missions.append(mission)
         
         # Plot nearby missions
         for i, mission in enumerate(nearby_missions[:15]):  # Limit to 15 for clarity
-            waypoints = np.array([(wp[0], wp[1], wp[2]) for wp in mission.waypoints])
+            waypoints = mission.waypoint_array()[:, :3]
             if len(waypoints) > 0:
                 self.ax.plot(waypoints[:, 0], waypoints[:, 1], waypoints[:, 2], 
                             'b-', alpha=0.6, linewidth=2, markersize=6, 
@@ -488,7 +2034,7 @@ class VisualizationWindow:
             return
         
         # Plot primary mission
-        primary_waypoints = np.array([(wp[0], wp[1], wp[2]) for wp in self.dcs.primary_mission.waypoints])
+        primary_waypoints = self.dcs.primary_mission.waypoint_array()[:, :3]
         if len(primary_waypoints) > 0:
             self.ax.plot(primary_waypoints[:, 0], primary_waypoints[:, 1], primary_waypoints[:, 2], 
                         'ro-', linewidth=4, markersize=10, label='Primary Mission', alpha=0.8)
@@ -499,30 +2045,19 @@ class VisualizationWindow:
             return
         
         # Plot conflicted missions
-        conflict_points = []
         for i, mission in enumerate(self.dcs.conflicted_missions):
-            waypoints = np.array([(wp[0], wp[1], wp[2]) for wp in mission.waypoints])
+            waypoints = mission.waypoint_array()[:, :3]
             if len(waypoints) > 0:
                 color = 'orange' if mission.status == "active" else 'red'
                 linestyle = '--' if mission.status == "active" else ':'
                 
                 self.ax.plot(waypoints[:, 0], waypoints[:, 1], waypoints[:, 2], 
                             color=color, linestyle=linestyle, linewidth=3, markersize=8,
-                            label=f'Conflict {i+1}' if i < 5 else "")
-                
-                # Find and mark conflict points
-                for primary_wp in self.dcs.primary_mission.waypoints:
-                    for mission_wp in mission.waypoints:
-                        distance = np.sqrt((primary_wp[0]-mission_wp[0])**2 + 
-                                         (primary_wp[1]-mission_wp[1])**2 + 
-                                         (primary_wp[2]-mission_wp[2])**2)
-                        time_diff = abs((primary_wp[3] - mission_wp[3]).total_seconds())
-                        if distance < 100 and time_diff < 60:  # Conflict criteria
-                            conflict_points.append((mission_wp[0], mission_wp[1], mission_wp[2]))
-        
-        # Plot all conflict points
-        if conflict_points:
-            conflict_array = np.array(conflict_points)
+                            label=f'Conflict {i+1} ({mission.severity})' if i < 5 else "")
+        
+        # Plot conflict points precomputed by check_conflicts
+        if self.dcs.conflict_points:
+            conflict_array = np.array([(p['x'], p['y'], p['z']) for p in self.dcs.conflict_points])
             self.ax.scatter(conflict_array[:, 0], conflict_array[:, 1], conflict_array[:, 2], 
                           c='red', s=200, marker='X', alpha=0.8, label='Conflict Points')
         
@@ -545,10 +2080,10 @@ class VisualizationWindow:
         # Plot all active missions
         mission_count = 0
         for mission in active_missions[:25]:  # Limit to 25 for clarity
-            waypoints = np.array([(wp[0], wp[1], wp[2]) for wp in mission.waypoints])
+            waypoints = mission.waypoint_array()[:, :3]
             if len(waypoints) > 0:
                 # Different styling for primary vs regular missions
-                if mission.mission_id.startswith('PRIMARY') or mission.mission_id.startswith('HIGH_CONFLICT'):
+                if str(mission.mission_id).startswith(('PRIMARY', 'HIGH_CONFLICT', 'STRESS_PRIMARY')):
                     color = 'red'
                     linestyle = '-'
                     linewidth = 4
@@ -574,6 +2109,46 @@ class VisualizationWindow:
         if mission_count > 0:
             self.ax.legend()
 
+class ThresholdSweepWindow:
+    def __init__(self, parent, sweep):
+        self.parent = parent
+        self.sweep = sweep
+        self.setup_sweep_window()
+    
+    def setup_sweep_window(self):
+        """Create window with the sensitivity table and plot"""
+        self.sweep_window = tk.Toplevel(self.parent)
+        self.sweep_window.title("Conflict Threshold Sensitivity")
+        self.sweep_window.geometry("900x700")
+        
+        main_frame = ttk.Frame(self.sweep_window, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        table_frame = ttk.LabelFrame(main_frame, text="Conflicts per Threshold Combination", padding="5")
+        table_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        counts = self.sweep['counts']
+        table_text = tk.Text(table_frame, height=len(counts) + 3, width=100)
+        table_text.pack(fill=tk.X)
+        table_text.insert(tk.END, counts.to_string())
+        table_text.config(state=tk.DISABLED)
+        
+        ttk.Button(main_frame, text="Close", command=self.sweep_window.destroy).pack(anchor=tk.E)
+        
+        self.fig = plt.Figure(figsize=(9, 5), dpi=100)
+        ax = self.fig.add_subplot(111)
+        for time_threshold, row in counts.iterrows():
+            ax.plot(counts.columns, row.values, 'o-', label=f'Time threshold {time_threshold} s')
+        ax.set_xlabel('Safety Distance (m)')
+        ax.set_ylabel('Conflicted Missions')
+        ax.set_title('Conflict Count Sensitivity', fontsize=14)
+        ax.grid(True, alpha=0.3)
+        ax.legend()
+        
+        self.canvas = FigureCanvasTkAgg(self.fig, main_frame)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.canvas.draw()
+
 class DCSGUI:
     def __init__(self, root):
         self.root = root
@@ -581,6 +2156,8 @@ class DCSGUI:
         self.root.geometry("1200x800")
         
         self.dcs = DroneConflictDetectionSystem()
+        # Re-opening the app re-checks the same airspace; serve repeats from disk
+        self.dcs.conflict_cache = ConflictResultCache()
         
         # Load existing data if available
         self.load_existing_data()
@@ -593,18 +2170,27 @@ class DCSGUI:
             if os.path.exists(self.dcs.simulated_missions_file):
                 self.dcs.simulated_missions = self.dcs.load_missions_from_csv(self.dcs.simulated_missions_file)
                 print(f"Loaded {len(self.dcs.simulated_missions)} existing simulated missions")
+                # Work on the simulated_missions objects so aborts and checks see the same missions
+                self.dcs.airspace_data = [m for m in self.dcs.simulated_missions if m.status == "active"]
             
             if os.path.exists(self.dcs.airspace_data_file):
-                airspace_missions = self.dcs.load_missions_from_csv(self.dcs.airspace_data_file)
-                self.dcs.airspace_data = airspace_missions
-                print(f"Loaded {len(self.dcs.airspace_data)} existing airspace missions")
+                if os.path.exists(self.dcs.simulated_missions_file):
+                    # Only the ids are needed for the consistency check
+                    airspace_count = pd.read_csv(self.dcs.airspace_data_file, usecols=['mission_id'])['mission_id'].nunique()
+                else:
+                    self.dcs.airspace_data = self.dcs.load_missions_from_csv(self.dcs.airspace_data_file)
+                    airspace_count = len(self.dcs.airspace_data)
+                print(f"Loaded {airspace_count} existing airspace missions")
                 
                 # Verify consistency
                 active_in_simulated = len([m for m in self.dcs.simulated_missions if m.status == "active"])
-                if len(self.dcs.airspace_data) != active_in_simulated:
-                    print(f"Warning: Inconsistency detected. Active in simulated: {active_in_simulated}, in airspace: {len(self.dcs.airspace_data)}")
+                if airspace_count != active_in_simulated:
+                    print(f"Warning: Inconsistency detected. Active in simulated: {active_in_simulated}, in airspace: {airspace_count}")
                     # Fix the inconsistency
                     self.dcs.update_airspace_data_csv()
+            
+            self.dcs.archived_missions = self.dcs.count_archived_missions()
+            self.dcs.complete_expired_missions()
         except Exception as e:
             print(f"Error loading existing data: {e}")
         
@@ -639,6 +2225,10 @@ class DCSGUI:
                   command=self.reset_all_data).grid(row=1, column=1, padx=5, pady=2)
         ttk.Button(control_frame, text="Visualize Missions (3D)", 
                   command=self.visualize_missions).grid(row=1, column=2, padx=5, pady=2)
+        ttk.Button(control_frame, text="Accept Mission Queue", 
+                  command=self.accept_mission_queue).grid(row=1, column=3, padx=5, pady=2)
+        ttk.Button(control_frame, text="Stress Test: 5000 Conflicts", 
+                  command=self.generate_stress_test).grid(row=2, column=0, padx=5, pady=2)
         
         # Status frame
         status_frame = ttk.LabelFrame(main_frame, text="System Status", padding="10")
@@ -661,18 +2251,22 @@ class DCSGUI:
                   command=self.reject_mission).grid(row=0, column=3, padx=5)
         ttk.Button(conflict_frame, text="Abort All Conflicts", 
                   command=self.abort_all_conflicts).grid(row=0, column=4, padx=5)
+        ttk.Button(conflict_frame, text="Suggest Resolution", 
+                  command=self.suggest_resolution).grid(row=0, column=5, padx=5)
+        ttk.Button(conflict_frame, text="Threshold Sweep", 
+                  command=self.sweep_thresholds).grid(row=0, column=6, padx=5)
         
         # Results frame
         results_frame = ttk.LabelFrame(main_frame, text="Conflict Results", padding="10")
         results_frame.grid(row=4, column=0, columnspan=4, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
         
         # Treeview for conflicted missions
-        columns = ("Mission ID", "Start Time", "Duration", "Status", "Last Status Update", "Action")
+        columns = ("Mission ID", "Severity", "Start Time", "Duration", "Status", "Last Status Update", "Action")
         self.conflict_tree = ttk.Treeview(results_frame, columns=columns, show="headings", height=5)
         
         for col in columns:
             self.conflict_tree.heading(col, text=col)
-            if col in ["Mission ID", "Action"]:
+            if col in ["Mission ID", "Severity", "Action"]:
                 self.conflict_tree.column(col, width=120)
             else:
                 self.conflict_tree.column(col, width=150)
@@ -723,6 +2317,23 @@ class DCSGUI:
         
         self.update_status("System initialized. Ready to generate missions.")
         self.update_stats()
+        
+        self.root.after(MISSION_LIFECYCLE_INTERVAL_MS, self.complete_expired_missions)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+    
+    def on_close(self):
+        """Release worker processes and shared memory before closing the window"""
+        self.dcs.shutdown()
+        self.root.destroy()
+    
+    def complete_expired_missions(self):
+        """Periodically move missions whose flight window has ended to the history file"""
+        completed = self.dcs.complete_expired_missions()
+        if completed:
+            self.update_status(f"{len(completed)} expired missions completed and archived to {self.dcs.mission_history_file}.")
+            self.update_conflict_tree(self.dcs.conflicted_missions)
+            self.update_stats()
+        self.root.after(MISSION_LIFECYCLE_INTERVAL_MS, self.complete_expired_missions)
     
     def on_selection_change(self, event):
         """Update selection info when missions are selected"""
@@ -756,6 +2367,7 @@ class DCSGUI:
     
     def refresh_data(self):
         """Refresh mission data from CSV files"""
+        self.dcs.flush()  # Read back what is queued for writing, not a stale file
         self.load_existing_data()
         self.update_status("Mission data refreshed from CSV files")
         self.update_stats()
@@ -784,6 +2396,23 @@ class DCSGUI:
         # Auto-check conflicts
         self.check_conflicts()
     
+    def generate_stress_test(self):
+        """Replace the airspace with a stress scenario and check its first primary"""
+        if not messagebox.askyesno("Confirm Stress Test", 
+                                 "This replaces all simulated missions with a 10000-mission stress scenario. Continue?"):
+            return
+        
+        def generate():
+            self.update_status("Generating stress scenario (5000 conflicts, 10 primaries)...")
+            scenario = self.dcs.generate_stress_scenario(5000, near_miss_ratio=1.0, num_primaries=10)
+            expected = len(scenario['expected_conflicts'][self.dcs.primary_mission.mission_id])
+            self.update_status(f"Stress scenario generated. {self.dcs.primary_mission.mission_id} "
+                               f"expects {expected} conflicts.")
+            self.update_stats()
+            self.root.after(0, self.check_conflicts)
+        
+        threading.Thread(target=generate).start()
+    
     def generate_primary_mission(self):
         self.update_status("Generating primary mission...")
         self.dcs.generate_primary_mission()
@@ -794,6 +2423,7 @@ class DCSGUI:
         filename = filedialog.askopenfilename(title="Select Primary Mission CSV", 
                                             filetypes=[("CSV files", "*.csv")])
         if filename:
+            self.dcs.flush()  # The chosen file may still be queued for writing
             missions = self.dcs.load_missions_from_csv(filename)
             if missions:
                 self.dcs.primary_mission = missions[0]
@@ -802,6 +2432,29 @@ class DCSGUI:
             else:
                 messagebox.showerror("Error", "Failed to load primary mission from file.")
     
+    def accept_mission_queue(self):
+        """Accept or reject every mission in a CSV file, in file order"""
+        filename = filedialog.askopenfilename(title="Select Candidate Missions CSV", 
+                                            filetypes=[("CSV files", "*.csv")])
+        if not filename:
+            return
+        
+        self.dcs.flush()  # The chosen file may still be queued for writing
+        candidates = self.dcs.load_missions_from_csv(filename)
+        if not candidates:
+            messagebox.showerror("Error", "Failed to load candidate missions from file.")
+            return
+        
+        def plan():
+            self.update_status(f"Planning acceptance of {len(candidates)} missions...")
+            plan = self.dcs.plan_mission_acceptance(candidates)
+            accepted = sum(1 for entry in plan if entry['decision'] == "accepted")
+            self.update_status(f"Mission queue processed: {accepted} accepted, {len(plan) - accepted} rejected. "
+                               "Both CSV files updated.")
+            self.update_stats()
+        
+        threading.Thread(target=plan).start()
+    
     def check_conflicts(self):
         if not self.dcs.primary_mission:
             messagebox.showwarning("Warning", "Please generate or upload a primary mission first.")
@@ -813,10 +2466,7 @@ class DCSGUI:
         
         def check():
             self.update_status("Checking for conflicts...")
-            conflicted_missions = self.dcs.check_conflicts(
-                self.dcs.primary_mission, 
-                [m for m in self.dcs.simulated_missions if m.status == "active"]
-            )
+            conflicted_missions = self.check_active_conflicts()
             
             self.update_conflict_tree(conflicted_missions)
             self.update_status(f"Conflict check completed. Found {len(conflicted_missions)} conflicts.")
@@ -824,16 +2474,20 @@ class DCSGUI:
         
         threading.Thread(target=check).start()
     
+    def check_active_conflicts(self):
+        """Check the primary mission against active missions, in worker processes for large airspaces"""
+        # Both paths read airspace_data, which holds the active simulated_missions objects
+        if len(self.dcs.airspace_data) >= PARALLEL_CHECK_MIN_MISSIONS:
+            return self.dcs.check_conflicts_parallel(self.dcs.primary_mission)
+        return self.dcs.check_conflicts(self.dcs.primary_mission, self.dcs.airspace_data)
+    
     def recheck_conflicts(self):
         if not self.dcs.primary_mission:
             return
         
         def recheck():
             self.update_status("Re-checking conflicts...")
-            conflicted_missions = self.dcs.check_conflicts(
-                self.dcs.primary_mission, 
-                [m for m in self.dcs.simulated_missions if m.status == "active"]
-            )
+            conflicted_missions = self.check_active_conflicts()
             
             self.update_conflict_tree(conflicted_missions)
             self.update_status(f"Re-check completed. Found {len(conflicted_missions)} conflicts.")
@@ -841,6 +2495,59 @@ class DCSGUI:
         
         threading.Thread(target=recheck).start()
     
+    def suggest_resolution(self):
+        """Offer the smallest departure shift / altitude offset that clears all conflicts"""
+        if not self.dcs.primary_mission:
+            messagebox.showwarning("Warning", "Please generate or upload a primary mission first.")
+            return
+        
+        primary = self.dcs.primary_mission
+        
+        def search():
+            self.update_status("Searching for a conflict-free resolution...")
+            resolution = self.dcs.suggest_resolution(primary)
+            self.update_status("Resolution search completed.")
+            # Dialogs must run on the Tk thread
+            self.root.after(0, lambda: self.offer_resolution(primary, resolution))
+        
+        threading.Thread(target=search).start()
+    
+    def offer_resolution(self, primary, resolution):
+        """Ask the operator to apply a suggest_resolution result to the primary mission"""
+        if primary is not self.dcs.primary_mission:
+            return  # The primary mission changed while the search was running
+        if resolution is None:
+            messagebox.showinfo("Info", "No conflict-free departure shift or altitude offset found.")
+            return
+        if resolution['time_shift'] == 0 and resolution['altitude_offset'] == 0:
+            messagebox.showinfo("Info", "Primary mission is already conflict free.")
+            return
+        
+        if messagebox.askyesno("Suggested Resolution", 
+                             f"Shift departure by {resolution['time_shift'] / 60:+.0f} min and altitude by "
+                             f"{resolution['altitude_offset']:+.0f} m?\n"
+                             f"({resolution['clear_variants']} of {resolution['variants_evaluated']} variants are conflict free)"):
+            self.dcs.apply_resolution(primary, resolution)
+            self.update_status(f"Resolution applied to {primary.mission_id}.")
+            self.recheck_conflicts()
+    
+    def sweep_thresholds(self):
+        """Show how conflict counts change across safety distances and time thresholds"""
+        if not self.dcs.primary_mission:
+            messagebox.showwarning("Warning", "Please generate or upload a primary mission first.")
+            return
+        
+        primary = self.dcs.primary_mission
+        
+        def sweep():
+            self.update_status("Sweeping conflict thresholds...")
+            result = self.dcs.sweep_conflict_thresholds(primary)
+            self.update_status(f"Threshold sweep completed over {result['counts'].size} combinations.")
+            # Windows must be created on the Tk thread
+            self.root.after(0, lambda: ThresholdSweepWindow(self.root, result))
+        
+        threading.Thread(target=sweep).start()
+    
     def abort_selected_mission(self):
         """Abort selected missions from the table (single or multiple)"""
         selected_items = self.conflict_tree.selection()
@@ -904,6 +2611,7 @@ class DCSGUI:
         for mission in conflicted_missions:
             self.conflict_tree.insert("", "end", values=(
                 mission.mission_id,
+                mission.severity,
                 mission.start_time.strftime("%Y-%m-%d %H:%M"),
                 f"{mission.duration.total_seconds()/60:.0f} min",
                 mission.status,
@@ -917,6 +2625,16 @@ class DCSGUI:
     
     def update_stats(self):
         stats = self.dcs.get_mission_statistics()
+        persistence = stats['persistence']
+        if persistence is not None:
+            persistence_text = (f"CSV write-behind: {persistence['queue_depth']} pending | "
+                                f"last flush {persistence['last_flush_ms']:.0f} ms | "
+                                f"{persistence['coalesced_writes']} writes coalesced")
+            if persistence['failed_flushes']:
+                persistence_text += (f"\nCSV write-behind FAILED {persistence['failed_flushes']} time(s), "
+                                     f"last error: {persistence['last_error']}")
+        else:
+            persistence_text = "CSV write-behind: disabled (synchronous writes)"
         
         stats_text = f"""
 Total Missions in simulated_missions.csv: {stats['total_simulated']}
@@ -924,15 +2642,76 @@ Status: Active: {stats['active_missions']} | Aborted: {stats['aborted_missions']
 Active Missions in airspace_data.csv: {stats['airspace_missions']}
 Primary Mission: {stats['primary_mission'] or 'None'}
 Current Conflicts: {stats['current_conflicts']}
+{persistence_text}
 
 CSV Files Usage:
 - simulated_missions.csv: All missions with status (active/aborted/inactive) - Total: {stats['total_simulated']}
 - airspace_data.csv: Only active missions (accepted missions) - Total: {stats['airspace_missions']}
+- mission_history.csv: Completed missions archived from the active set - Total: {stats['archived_missions']}
         """
         self.stats_text.delete(1.0, tk.END)
         self.stats_text.insert(1.0, stats_text.strip())
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drone Conflict Detection System")
+    parser.add_argument("--memory-report", type=int, metavar="N",
+                        help="measure the memory footprint of N missions and exit")
+    parser.add_argument("--waypoints", type=int, default=5,
+                        help="waypoints per mission for the memory report")
+    parser.add_argument("--float32", action="store_true",
+                        help="store waypoint coordinates as float32")
+    parser.add_argument("--load-test", type=int, metavar="EVENTS",
+                        help="replay EVENTS seeded operator events headless and report latencies")
+    parser.add_argument("--airspace", type=int, default=1000,
+                        help="simulated missions in the load-test airspace / stress-test background")
+    parser.add_argument("--seed", type=int, default=0, help="load-test scenario seed")
+    parser.add_argument("--rate", type=float, help="load-test arrival rate in events/s (default: back to back)")
+    parser.add_argument("--mix", type=parse_event_mix,
+                        help="load-test event weights, e.g. check=0.5,abort=0.2,new_primary=0.2,accept=0.1")
+    parser.add_argument("--stress-test", type=int, metavar="CONFLICTS",
+                        help="generate a stress scenario with CONFLICTS targeted conflicts, verify and time it")
+    parser.add_argument("--near-miss-ratio", type=float, default=1.0,
+                        help="near misses per targeted conflict in the stress scenario")
+    parser.add_argument("--primaries", type=int, default=10, help="primary missions in the stress scenario")
+    parser.add_argument("--record", metavar="FILE", help="save the load-test scenario to FILE")
+    parser.add_argument("--replay", metavar="FILE", help="replay a recorded load-test scenario")
+    args = parser.parse_args(argv)
+    
+    if args.memory_report:
+        coordinate_dtype = np.float32 if args.float32 else np.float64
+        print_memory_report(measure_mission_memory(args.memory_report, args.waypoints, coordinate_dtype))
+        return
+    
+    if args.stress_test:
+        dcs = DroneConflictDetectionSystem(write_behind=False)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            started = time.perf_counter()
+            scenario = dcs.generate_stress_scenario(args.stress_test, args.near_miss_ratio, args.primaries,
+                                                    args.airspace, seed=args.seed, save_to_csv=False)
+            generate_seconds = time.perf_counter() - started
+            results = dcs.verify_stress_scenario(scenario)
+        errors = sum(len(r['missing']) + len(r['unexpected']) for r in results)
+        print(f"Airspace: {len(dcs.airspace_data)} missions | generated in {generate_seconds:.2f} s")
+        print(f"Expected conflicts: {sum(r['expected'] for r in results)} | "
+              f"found: {sum(r['found'] for r in results)} | mismatches: {errors}")
+        print(f"Check time: {sum(r['seconds'] for r in results):.3f} s total, "
+              f"{max(r['seconds'] for r in results) * 1000:.1f} ms worst primary")
+        print("Result: " + ("OK" if errors == 0 else "MISMATCH"))
+        return
+    
+    if args.load_test or args.replay:
+        if args.replay:
+            scenario = load_scenario(args.replay)
+        else:
+            scenario = record_scenario(args.load_test, args.airspace, args.seed, args.mix, args.rate)
+        if args.record:
+            save_scenario(scenario, args.record)
+        # The system prints every write and conflict; keep the report readable
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            report = replay_scenario(scenario)
+        print_load_report(report)
+        return
+    
     root = tk.Tk()
     app = DCSGUI(root)
     root.mainloop()